@@ -1,9 +1,25 @@
+import numpy as np
 from psychopy import event
 from psychopy.visual import Window
 
 from src.config import get_config, DemoConfig
 from src.agents import Sheep, Wolf
-from src.utils import create_window
+from src.shared_state import SimulationProcess
+from src.simulation import AgentGroup
+from src.telemetry import FrameStats, Snapshot
+from src.trails import MotionTrails
+from src.utils import (
+    create_input_source,
+    create_rng,
+    create_spawn_layout,
+    create_window,
+    parse_replay_args,
+    save_recording,
+    start_telemetry,
+    sync_agents,
+    use_simulation_process,
+    warm_up,
+)
 from typing import cast
 
 config: DemoConfig = cast(DemoConfig, get_config(config_type="demo"))
@@ -12,32 +28,114 @@ config: DemoConfig = cast(DemoConfig, get_config(config_type="demo"))
 def main() -> None:
     """The main function that runs the demo."""
     win: Window = create_window(config=config)
+    rng = create_rng(config)
 
-    sheep: Sheep = Sheep(win, agent_config=config.sheep)
+    sheep: Sheep = Sheep(
+        win,
+        agent_config=config.sheep,
+        input_source=create_input_source(win, config),
+    )
+    # Spread the wolves out, away from each other and from the sheep
+    (start_positions,) = create_spawn_layout(
+        config, [config.wolf], [config.wolf.count], safe_pos=sheep.pos
+    )
     wolves: list[Wolf] = [
-        Wolf(win, agent_config=config.wolf) for _ in range(config.wolf.count)
+        Wolf(win, agent_config=config.wolf, pos=tuple(pos)) for pos in start_positions
     ]
 
-    while not event.getKeys(keyList=config.keys.quit):
-        if event.getKeys(keyList=config.keys.toggle_condition):
+    # The wolves are moved as one batch, either here or in a simulation process
+    pack: AgentGroup | None = None
+    simulation: SimulationProcess | None = None
+    if use_simulation_process(config):
+        simulation = SimulationProcess(
+            [(config.wolf, config.wolf.count)],
+            positions=start_positions,
+            seed=config.replay.seed,
+        )
+        simulation.start(sheep.pos)
+    else:
+        pack = AgentGroup(
+            config.wolf, config.wolf.count, positions=start_positions, rng=rng
+        )
+
+    # Every trail (the wolves' and the sheep's) is drawn in one batch
+    trails: MotionTrails | None = None
+    if config.trails.enabled:
+        trails = MotionTrails(
+            win,
+            colors=[config.wolf.config.color] * len(wolves)
+            + [config.sheep.config.color],
+            length=config.trails.length,
+            width=config.trails.width,
+            opacity=config.trails.opacity,
+        )
+
+    # Get PsychoPy's first-draw stutter out of the way before the loop starts
+    stimuli = [sheep, *wolves] + ([trails] if trails is not None else [])
+    warm_up(win, stimuli, config)
+
+    telemetry = start_telemetry(config)
+    frame_stats = FrameStats(win.monitorFramePeriod)
+
+    # A replayed session ends with its trace
+    while (
+        not event.getKeys(keyList=config.keys.quit) and not sheep.input_source.finished
+    ):
+        # Remote commands arrive from the telemetry server without ever blocking
+        commands = telemetry.poll_commands() if telemetry is not None else []
+        if "abort" in commands:
+            break
+
+        if (
+            event.getKeys(keyList=config.keys.toggle_condition)
+            or "toggle_condition" in commands
+        ):
             # Toggle face_target for all wolves
             config.wolf.face_target = not config.wolf.face_target
-            for wolf in wolves:
-                if hasattr(wolf, "face_target"):
-                    wolf.face_target = config.wolf.face_target
+            if simulation is not None:
+                simulation.set_face_target(0, config.wolf.face_target)
+            else:
+                pack.face_target = config.wolf.face_target
 
         sheep.update()
 
-        for wolf in wolves:
-            wolf.update(sheep.pos)
+        if simulation is not None:
+            simulation.set_target(sheep.pos)
+            positions, oris = simulation.latest()
+        else:
+            pack.step(sheep.pos)
+            positions, oris = pack.positions, pack.oris
+        sync_agents(wolves, positions, oris)
 
+        if trails is not None:
+            trails.update(np.vstack([positions, sheep.pos]))
+            trails.draw()  # first, so the trails are behind the agents
         sheep.draw()
         for wolf in wolves:
             wolf.draw()
         win.flip()
+        frame_stats.tick()
+
+        if telemetry is not None:
+            telemetry.publish(
+                Snapshot(
+                    frame=frame_stats.n_frames,
+                    time=frame_stats.elapsed,
+                    frame_rate=frame_stats.frame_rate,
+                    dropped_frames=frame_stats.dropped_frames,
+                    face_target=config.wolf.face_target,
+                    n_agents=len(wolves),
+                )
+            )
 
+    if telemetry is not None:
+        telemetry.stop()
+    if simulation is not None:
+        simulation.stop()
+    save_recording(sheep.input_source, win, config)
     win.close()
 
 
 if __name__ == "__main__":
+    parse_replay_args(config)
     main()
@@ -1,12 +1,27 @@
-import math
-
 import numpy as np
 from psychopy import core, event, visual
 from psychopy.visual import Window
 
 from src.agents import Sheep, Wolf
+from src.collision import CollisionShape, overlaps
 from src.config import get_config, DontGetCaughtConfig
-from src.utils import create_window
+from src.shared_state import SimulationProcess
+from src.simulation import AgentGroup
+from src.telemetry import FrameStats, Snapshot
+from src.utils import (
+    FrameClock,
+    create_input_source,
+    create_replay_clock,
+    create_rng,
+    create_spawn_layout,
+    create_window,
+    parse_replay_args,
+    save_recording,
+    start_telemetry,
+    sync_agents,
+    use_simulation_process,
+    warm_up,
+)
 from typing import cast
 
 config: DontGetCaughtConfig = cast(
@@ -19,9 +34,11 @@ TEXT_HEIGHT = 0.7
 
 def main() -> None:
     """Don't Get Caught game based on Gao et al. 2010 Experiment 2."""
-    clock = core.Clock()
+    # Replayed sessions run unattended and count frames instead of real time
+    replaying = config.replay.trace_path is not None
 
     win: Window = create_window(config=config)
+    rng = create_rng(config)
 
     # Display instructions
     instructions = visual.TextStim(
@@ -35,7 +52,8 @@ def main() -> None:
     )
     instructions.draw()
     win.flip()
-    event.waitKeys(timeStamped=True)
+    if not replaying:
+        event.waitKeys(timeStamped=True)
 
     # Game state
     game_over = False
@@ -54,24 +72,84 @@ def main() -> None:
     )
 
     # Player (sheep) that follows the mouse cursor
-    player = Sheep(win, agent_config=config.sheep)
+    player = Sheep(
+        win,
+        agent_config=config.sheep,
+        input_source=create_input_source(win, config),
+    )
+    # Replays run at the frame rate their trace was recorded at
+    clock = (
+        create_replay_clock(player.input_source, win, config)
+        if replaying
+        else core.Clock()
+    )
+
+    # Spread every agent out, away from each other and from the player
+    groups = [config.wolf, config.dart_distractors, config.circle_distractors]
+    hunter_positions, dart_positions, circle_positions = create_spawn_layout(
+        config, groups, [group.count for group in groups], safe_pos=player.pos
+    )
 
     # Create the hunter (wolf) - a nondescript circle that follows the player/cursor
-    hunters = [Wolf(win, agent_config=config.wolf)]
+    hunters = [
+        Wolf(win, agent_config=config.wolf, pos=tuple(pos)) for pos in hunter_positions
+    ]
 
     # Distractor setup
     dart_distractors = [
-        Wolf(win, agent_config=config.dart_distractors)
-        for _ in range(config.dart_distractors.count)
+        Wolf(win, agent_config=config.dart_distractors, pos=tuple(pos))
+        for pos in dart_positions
     ]
     circle_distractors = [
-        Wolf(win, agent_config=config.circle_distractors)
-        for _ in range(config.circle_distractors.count)
+        Wolf(win, agent_config=config.circle_distractors, pos=tuple(pos))
+        for pos in circle_positions
     ]
 
     # All distractors in one list
     distractors = dart_distractors + circle_distractors
 
+    # Every group is moved as one batch by the motion policy in its config
+    hunter_pack = AgentGroup(
+        config.wolf,
+        len(hunters),
+        positions=hunter_positions,
+        rng=rng,
+    )
+
+    # Captures are checked against the agents' actual outlines, whatever their shape
+    hunter_shape = CollisionShape.from_agent_config(config.wolf)
+    player_shape = CollisionShape.from_agent_config(config.sheep)
+
+    # Optionally move the distractors in a separate process; the hunters stay here
+    # so that captures are always checked against the current frame
+    distractor_packs: list[tuple[AgentGroup, list[Wolf]]] = []
+    simulation: SimulationProcess | None = None
+    if use_simulation_process(config):
+        simulation = SimulationProcess(
+            [
+                (config.dart_distractors, config.dart_distractors.count),
+                (config.circle_distractors, config.circle_distractors.count),
+            ],
+            positions=np.concatenate([dart_positions, circle_positions]),
+            seed=config.replay.seed,
+        )
+        simulation.start(player.pos)
+    else:
+        for agent_config, agents, positions in [
+            (config.dart_distractors, dart_distractors, dart_positions),
+            (config.circle_distractors, circle_distractors, circle_positions),
+        ]:
+            pack = AgentGroup(agent_config, len(agents), positions=positions, rng=rng)
+            distractor_packs.append((pack, agents))
+
+    # Draw everything offscreen first, so the first timed frames don't stutter
+    # while PsychoPy sets up each stimulus
+    warm_up(win, [*distractors, *hunters, player, score_text, timer_text], config)
+
+    telemetry = start_telemetry(config)
+    frame_stats = FrameStats(win.monitorFramePeriod)
+    aborted = False
+
     # Start clock
     clock.reset()
 
@@ -79,34 +157,55 @@ def main() -> None:
     while (
         not event.getKeys(keyList=config.keys.quit) and not game_over and not win_game
     ):
-        if event.getKeys(keyList=config.keys.toggle_condition):
+        # Remote commands arrive from the telemetry server without ever blocking
+        commands = telemetry.poll_commands() if telemetry is not None else []
+        if "abort" in commands:
+            aborted = True
+            break
+
+        if (
+            event.getKeys(keyList=config.keys.toggle_condition)
+            or "toggle_condition" in commands
+        ):
             config.dart_distractors.face_target = (
                 not config.dart_distractors.face_target
             )
-            for distractor in dart_distractors:
-                if hasattr(distractor, "face_target"):
-                    distractor.face_target = config.dart_distractors.face_target
+            if simulation is not None:
+                simulation.set_face_target(0, config.dart_distractors.face_target)
+            else:
+                dart_pack, _ = distractor_packs[0]
+                dart_pack.face_target = config.dart_distractors.face_target
 
+        previous_player_pos = player.pos
         player.update()
 
-        # Update hunting wolf or wolves (always pursue the player in a heat-seeking fashion)
-        for hunter in hunters:
-            dx = player.pos[0] - hunter.pos[0]
-            dy = player.pos[1] - hunter.pos[1]
-            hunter.direction = np.arctan2(dy, dx)
-
-            hunter.update(player.pos)
-
-            # Check collision with player (if so, game over)
-            dx = hunter.pos[0] - player.pos[0]
-            dy = hunter.pos[1] - player.pos[1]
-            distance = math.sqrt(dx**2 + dy**2)
+        # Update hunting wolf or wolves (they pursue the player, see config.wolf.policy)
+        previous_hunter_positions = hunter_pack.positions.copy()
+        hunter_pack.step(player.pos)
+        sync_agents(hunters, hunter_pack.positions, hunter_pack.oris)
 
-            if distance < (hunter.radius + player.radius):
-                game_over = True
+        # Check collision with player (if so, game over), including anywhere
+        # along the way since the last frame so fast agents can't pass through
+        captured = overlaps(
+            hunter_shape,
+            hunter_pack.positions,
+            hunter_pack.oris,
+            player_shape,
+            player.pos,
+            player.ori,
+            previous_positions_a=previous_hunter_positions,
+            previous_positions_b=previous_player_pos,
+        )
+        if captured.any():
+            game_over = True
 
-        for distractor in distractors:
-            distractor.update(player.pos)
+        if simulation is not None:
+            simulation.set_target(player.pos)
+            sync_agents(distractors, *simulation.latest())
+        else:
+            for pack, agents in distractor_packs:
+                pack.step(player.pos)
+                sync_agents(agents, pack.positions, pack.oris)
 
         # Update timer and score
         current_time = clock.getTime()
@@ -128,6 +227,33 @@ def main() -> None:
         score_text.draw()
         timer_text.draw()
         win.flip()
+        frame_stats.tick()
+        if isinstance(clock, FrameClock):
+            clock.tick()
+
+        if telemetry is not None:
+            telemetry.publish(
+                Snapshot(
+                    frame=frame_stats.n_frames,
+                    time=current_time,
+                    frame_rate=frame_stats.frame_rate,
+                    dropped_frames=frame_stats.dropped_frames,
+                    face_target=config.dart_distractors.face_target,
+                    n_agents=len(hunters) + len(distractors),
+                    score=score,
+                )
+            )
+
+    if telemetry is not None:
+        telemetry.stop()
+    if simulation is not None:
+        simulation.stop()
+    save_recording(player.input_source, win, config)
+
+    # An experimenter who aborted remotely doesn't need the end screen
+    if aborted:
+        win.close()
+        return
 
     # Game end screen
     end_text = None
@@ -148,10 +274,12 @@ def main() -> None:
 
     end_text.draw()
     win.flip()
-    event.waitKeys(timeStamped=True)
+    if not replaying:
+        event.waitKeys(timeStamped=True)
 
     win.close()
 
 
 if __name__ == "__main__":
+    parse_replay_args(config)
     main()
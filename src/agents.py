@@ -1,8 +1,9 @@
 from abc import ABC, abstractmethod
 import numpy as np
-from .config import config, AgentConfig, CircleConfig, DartConfig, ShapeConfig
-from psychopy import visual, event
-from typing import Callable, Literal
+from .config import config, AgentConfig, CircleConfig, DartConfig
+from .inputs import InputSource, MouseInput
+from .shapes import resolve_shape_config
+from psychopy import visual
 
 
 # TODO: implement maximum speed of user-controlled sheep
@@ -22,17 +23,6 @@ class Agent(ABC):
         self.stimulus: visual.BaseVisualStim = self._create_stimulus(
             window, agent_config, pos
         )
-        self.frames_until_direction_update: int = (
-            self._generate_random_frames_until_direction_update(
-                *agent_config.direction_update_interval
-            )
-        )
-        self.frame_counter: int = 0
-
-    def _generate_random_frames_until_direction_update(
-        self, min_interval: int, max_interval: int
-    ) -> int:
-        return np.random.randint(min_interval, max_interval)
 
     def _create_stimulus(
         self, window: visual.Window, agent_config: AgentConfig, pos: tuple[float, float]
@@ -50,25 +40,10 @@ class Agent(ABC):
         Raises:
             ValueError: If the shape type is unknown
         """
-        if agent_config.shape_type == "circle":
-            shape_config = agent_config.config
-            if not isinstance(shape_config, CircleConfig):
-                # If somehow it's not a CircleConfig, create one with the specified color
-                shape_config = CircleConfig(
-                    color=shape_config.color, size=shape_config.size
-                )
+        shape_config = resolve_shape_config(agent_config)
+        if isinstance(shape_config, CircleConfig):
             return self._create_circle(window, shape_config, pos)
-
-        if agent_config.shape_type == "dart":
-            shape_config = agent_config.config
-            if not isinstance(shape_config, DartConfig):
-                # If somehow it's not a DartConfig, create one with the specified color
-                shape_config = DartConfig(
-                    color=shape_config.color, size=shape_config.size
-                )
-            return self._create_dart(window, shape_config, pos)
-
-        raise ValueError(f"Unknown shape type: {agent_config.shape_type}")
+        return self._create_dart(window, shape_config, pos)
 
     def _create_circle(
         self, window: visual.Window, config: CircleConfig, pos: tuple[float, float]
@@ -100,16 +75,6 @@ class Agent(ABC):
     def draw(self) -> None:
         self.stimulus.draw()
 
-    @property
-    def direction_in_deg(self) -> float:
-        """The direction of the agent in degrees."""
-        return np.degrees(self.direction)
-
-    @property
-    def direction_in_rad(self) -> float:
-        """The direction of the agent in radians."""
-        return self.direction
-
     @property
     def pos(self) -> tuple[float, float]:
         """The position of the agent (aka its stimulus's position)."""
@@ -181,8 +146,12 @@ class Agent(ABC):
 
 
 class Wolf(Agent):
-    """The wolf is a chevron that moves randomly (but smoothly) and either
-    faces towards the sheep or 90 degrees away from the sheep.
+    """The wolf is a chevron (or circle) that either faces towards the sheep or
+    90 degrees away from the sheep.
+
+    Wolves don't move themselves: every group of wolves is moved as one batch by
+    an `AgentGroup` (see src/simulation.py and src/policies.py), and the wolves
+    only show where their group put them.
     """
 
     def __init__(
@@ -204,144 +173,43 @@ class Wolf(Agent):
             )
         super().__init__(window=window, agent_config=agent_config, pos=pos)
 
-        self.speed: float = agent_config.speed
-        self.direction: float = np.random.uniform(0, 2 * np.pi)
-        self.direction_update_window: float = agent_config.direction_update_window
-        self.direction_update_interval: tuple[int, int] = (
-            agent_config.direction_update_interval
-        )
-        self.face_target: bool = agent_config.face_target  # only darts really need this
-
-    def calculate_facing_angle(
-        self,
-        target_pos: tuple[float, float],
-        units: Literal["deg", "rad"] = config.display.units,
-    ) -> float:
-        """Calculates the angle to the target in radians.
-
-        Args:
-            target_pos (tuple): The x, y coordinate of the target
-            units (Literal["deg", "rad"]): The angle's units
-
-        Returns:
-            float: The angle to the target (degrees or radians)
-        """
-        # Calculate angle to the target and convert to degrees
-        # 0° is horizontal, 90° is vertical (counter-clockwise)
-        x, y = self.pos
-        target_x, target_y = target_pos
-        dx = target_x - x
-        dy = target_y - y
-
-        angle = np.degrees(np.arctan2(dy, dx))
-
-        # Convert to PsychoPy's clockwise orientation system
-        angle = (90 - angle) % 360  # 0° is vertical, clockwise is positive
-
-        # Output in desired units
-        return angle if units == "deg" else np.radians(angle)
-
-    def _update_direction(self) -> None:
-        """Updates the direction within the allowed window."""
-        # Random angle within our window (centered on current direction)
-        max_deviation = self.direction_update_window / 2
-        angle_change = np.random.uniform(-max_deviation, max_deviation)
-        self.direction = (self.direction + angle_change) % (2 * np.pi)
-
-        # Reset counter and get new random interval
-        min_interval, max_interval = self.direction_update_interval
-        self.frames_until_direction_update = (
-            self._generate_random_frames_until_direction_update(
-                min_interval, max_interval
-            )
-        )
-        self.frame_counter = 0
-
-    def update(
-        self,
-        target_pos: tuple[float, float],
-    ) -> None:
-        """Updates the wolf's position and direction for the current frame.
-
-        Args:
-            target_pos (tuple): The x, y coordinate of the target
-        """
-        # Only update position and orientation if it's a dart
-        if not hasattr(self, "speed"):
-            return
-
-        # Update position
-        new_pos = tuple(
-            self.pos
-            + np.array(
-                [
-                    np.cos(self.direction) * self.speed,
-                    np.sin(self.direction) * self.speed,
-                ]
-            )
-        )
-        self.pos = new_pos  # automatically keeps within bounds!
-
-        # Check if it's time to update direction
-        self.frame_counter += 1
-        if self.frame_counter >= self.frames_until_direction_update:
-            self._update_direction()
-
-        # Update orientation if it's a dart
-        angle_to_target_deg = self.calculate_facing_angle(
-            target_pos, units=config.display.units
-        )
-        self.ori = angle_to_target_deg if self.face_target else angle_to_target_deg + 90
-
-    @property
-    def pos(self) -> tuple[float, float]:
-        return super().pos
-
-    @pos.setter
-    def pos(self, new_pos: tuple[float, float]) -> None:
-        """Sets the position of the wolf, keeping it within bounds.
-        If the wolf hits a boundary, it will bounce off in the opposite direction.
+    def update(self, pos: tuple[float, float], ori: float) -> None:
+        """Shows the wolf where its group moved it on the current frame.
 
         Args:
-            new_pos (tuple): The new position of the wolf
+            pos (tuple): The wolf's new position
+            ori (float): The wolf's new orientation (PsychoPy degrees)
         """
-
-        # Check if we hit a boundary and need to bounce off in the opposite direction
-        x, y = new_pos
-        if abs(x) > config.display.horizontal_boundary:
-            self.direction = np.pi - self.direction
-
-        if abs(y) > config.display.vertical_boundary:
-            self.direction = -self.direction
-
-        # Keep in bounds
-        self.stimulus.pos = self._get_bounded_pos(new_pos)
+        self.stimulus.pos = pos
+        self.stimulus.ori = ori
 
 
 class Sheep(Agent):
-    """The sheep is a circle that tracks the mouse within the boundaries defined."""
+    """The sheep is a circle that tracks the mouse within the boundaries defined.
+    Instead of the mouse, it can also follow any other input source (e.g. a
+    replayed mouse trace)."""
 
     def __init__(
         self,
         window: visual.Window,
         agent_config: AgentConfig = config.sheep,
         pos: tuple[float, float] | None = None,
+        input_source: InputSource | None = None,
     ) -> None:
         super().__init__(window=window, agent_config=agent_config, pos=pos)
         self.config = agent_config
-        self.mouse = event.Mouse(win=window)
+        if input_source is None:
+            input_source = MouseInput(window)
+        self.input_source: InputSource = input_source
         # handle case where mouse is not on screen (in part to get mypy to stop complaining)
-        mouse_pos = self.mouse.getPos()
+        mouse_pos = self.input_source.get_pos()
         if mouse_pos is None:
             mouse_pos = self.pos
         self.last_mouse_x, self.last_mouse_y = mouse_pos
 
-        if agent_config.shape_type == "dart":
-            self.direction = 0.0  # we will update this based on mouse movement
-
     def update(self) -> None:
         """Updates the sheep's position based on the mouse's position."""
-        current_pos = self.mouse.getPos()
+        current_pos = self.input_source.get_pos()
         # Handle case where getPos() returns None
         if current_pos is None:
             current_mouse_x, current_mouse_y = self.last_mouse_x, self.last_mouse_y
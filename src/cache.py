@@ -0,0 +1,244 @@
+"""Content-addressed on-disk cache of generated trials.
+
+The same configs and seed always produce the same trial, so trials are stored
+under a hash of the relevant config fields plus the seed. Every entry is a
+directory of .npy files that are loaded as read-only memory maps. Entries are
+published with an atomic rename, so concurrent workers either see a complete
+entry or none at all, and the least recently used entries are evicted once the
+cache grows past its size limit.
+"""
+
+import dataclasses
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator
+
+import numpy as np
+from .config import AgentConfig, DisplayConfig, SpawnConfig
+from .simulation import generate_trial
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# The display settings that change what a trial looks like (not e.g. which
+# screen it is shown on)
+DISPLAY_FIELDS = (
+    "width_cm",
+    "viewing_distance_cm",
+    "resolution_px",
+    "units",
+    "center_deg",
+    "horizontal_boundary",
+    "vertical_boundary",
+)
+
+
+def _canonical(value: Any) -> Any:
+    """Converts a value into plain JSON types, in a stable way."""
+    if isinstance(value, DisplayConfig):
+        return {name: _canonical(getattr(value, name)) for name in DISPLAY_FIELDS}
+    if dataclasses.is_dataclass(value):
+        fields = {
+            field.name: _canonical(getattr(value, field.name))
+            for field in dataclasses.fields(value)
+        }
+        return {"__type__": type(value).__name__, **fields}
+    if isinstance(value, np.ndarray):
+        digest = hashlib.sha256(np.ascontiguousarray(value).tobytes()).hexdigest()
+        return {"dtype": str(value.dtype), "shape": list(value.shape), "sha256": digest}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(item) for item in value]
+    if isinstance(value, dict):
+        return {str(key): _canonical(item) for key, item in value.items()}
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def trial_key(
+    agent_configs: AgentConfig | list[AgentConfig],
+    display_config: DisplayConfig,
+    seed: int,
+    **extras: Any,
+) -> str:
+    """A stable hash of everything that determines a trial.
+
+    Args:
+        agent_configs: The config(s) of the agents in the trial
+        display_config: The display the trial is generated for
+        seed: The seed the trial is generated with
+        **extras: Anything else that changes the trial (e.g. number of frames)
+
+    Returns:
+        A hex digest to use as the cache key
+    """
+    payload = _canonical(
+        {
+            "agents": agent_configs,
+            "display": display_config,
+            "seed": seed,
+            "extras": extras,
+        }
+    )
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+@contextmanager
+def _exclusive_lock(path: str) -> Iterator[None]:
+    """Holds an exclusive lock on `path` across processes."""
+    with open(path, "a+b") as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        else:
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class TrialCache:
+    """A size-bounded LRU cache of named arrays, safe to share between processes."""
+
+    def __init__(self, directory: str, max_bytes: int = 2**30) -> None:
+        self.directory: str = directory
+        self.max_bytes: int = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.directory, key)
+
+    def get(self, key: str) -> dict[str, np.ndarray] | None:
+        """Loads an entry as read-only memory maps, or None if it isn't cached."""
+        path = self._entry_path(key)
+        try:
+            arrays = {
+                filename[: -len(".npy")]: np.load(
+                    os.path.join(path, filename), mmap_mode="r"
+                )
+                for filename in os.listdir(path)
+                if filename.endswith(".npy")
+            }
+            os.utime(path)  # mark as recently used
+        except FileNotFoundError:
+            return None  # never cached, or evicted while we were loading it
+        return arrays
+
+    def put(self, key: str, arrays: dict[str, np.ndarray]) -> dict[str, np.ndarray]:
+        """Stores an entry (unless another process got there first) and loads it back."""
+        temp_path = tempfile.mkdtemp(prefix=".tmp-", dir=self.directory)
+        try:
+            for name, array in arrays.items():
+                np.save(os.path.join(temp_path, f"{name}.npy"), array)
+        except BaseException:
+            shutil.rmtree(temp_path, ignore_errors=True)
+            raise
+
+        try:
+            # Atomic: readers see the whole entry or nothing
+            os.rename(temp_path, self._entry_path(key))
+        except OSError:
+            # Another process published the same entry first; it is identical
+            shutil.rmtree(temp_path, ignore_errors=True)
+
+        self.evict(keep=key)
+        cached = self.get(key)
+        return cached if cached is not None else dict(arrays)
+
+    def get_or_create(
+        self, key: str, create: Callable[[], dict[str, np.ndarray]]
+    ) -> dict[str, np.ndarray]:
+        """Loads an entry, generating and storing it first if needed."""
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+        return self.put(key, create())
+
+    def size(self) -> int:
+        """The total size of all entries, in bytes."""
+        return sum(size for _, _, size in self._entries())
+
+    def _entries(self) -> list[tuple[str, float, int]]:
+        """(key, last use, size in bytes) for every complete entry."""
+        entries = []
+        for key in os.listdir(self.directory):
+            path = self._entry_path(key)
+            if key.startswith(".") or not os.path.isdir(path):
+                continue  # lock file or an entry that's still being written
+            try:
+                size = sum(
+                    os.path.getsize(os.path.join(path, filename))
+                    for filename in os.listdir(path)
+                )
+                entries.append((key, os.path.getmtime(path), size))
+            except FileNotFoundError:
+                continue  # evicted by another process in the meantime
+        return entries
+
+    def evict(self, keep: str | None = None) -> None:
+        """Removes the least recently used entries until the cache fits its limit.
+
+        Args:
+            keep: An entry that must not be evicted (e.g. the one just stored)
+        """
+        with _exclusive_lock(os.path.join(self.directory, ".lock")):
+            entries = sorted(self._entries(), key=lambda entry: entry[1])
+            total = sum(size for _, _, size in entries)
+            for key, _, size in entries:
+                if total <= self.max_bytes:
+                    break
+                if key == keep:
+                    continue
+                # Rename first so readers never see a half-deleted entry
+                trash_path = os.path.join(
+                    self.directory, f".trash-{key}-{time.time_ns()}"
+                )
+                try:
+                    os.rename(self._entry_path(key), trash_path)
+                except OSError:
+                    continue
+                shutil.rmtree(trash_path, ignore_errors=True)
+                total -= size
+
+
+def cached_trial(
+    cache: TrialCache,
+    agent_config: AgentConfig,
+    display_config: DisplayConfig,
+    seed: int,
+    count: int,
+    n_frames: int,
+    spawn_config: SpawnConfig,
+) -> dict[str, np.ndarray]:
+    """Loads a generated trial (see `generate_trial`) from the cache, generating
+    it only if it hasn't been generated before."""
+    key = trial_key(
+        agent_config,
+        display_config,
+        seed,
+        kind="trial",
+        count=count,
+        n_frames=n_frames,
+        spawn=spawn_config,
+    )
+    boundaries = (display_config.horizontal_boundary, display_config.vertical_boundary)
+    return cache.get_or_create(
+        key,
+        lambda: generate_trial(
+            agent_config, count, n_frames, seed, spawn_config, boundaries=boundaries
+        ),
+    )
@@ -0,0 +1,283 @@
+"""Shape-accurate collision tests between agents.
+
+Circles are tested as circles, and any other shape (e.g. a dart) as the union
+of convex pieces precomputed from its outline. Every test is vectorized over
+batches of agents. Tests can also be swept: given where the agents were on the
+previous frame, they report whether the agents touched at any point in
+between, so fast agents can't jump through each other from one frame to the
+next. Sweeps assume that agents move in a straight line between frames and
+use their current orientations.
+"""
+
+import numpy as np
+from .config import AgentConfig, CircleConfig
+from .shapes import local_vertices, resolve_shape_config, transform
+
+
+def _cross(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """The z component of the cross product of (..., 2) vectors."""
+    return a[..., 0] * b[..., 1] - a[..., 1] * b[..., 0]
+
+
+def _signed_area(vertices: np.ndarray) -> float:
+    """Positive for counterclockwise polygons, negative for clockwise ones."""
+    return float(_cross(vertices, np.roll(vertices, -1, axis=0)).sum() / 2)
+
+
+def convex_pieces(vertices: np.ndarray) -> np.ndarray:
+    """Splits a simple polygon into convex pieces.
+
+    Convex polygons are kept whole; concave ones are split into triangles by
+    ear clipping.
+
+    Args:
+        vertices: (n, 2) array of the polygon's vertices (in either direction)
+
+    Returns:
+        A (pieces, vertices per piece, 2) array of counterclockwise polygons
+
+    Raises:
+        ValueError: If the polygon isn't simple (e.g. it intersects itself)
+    """
+    vertices = np.asarray(vertices, dtype=float)
+    if _signed_area(vertices) < 0:
+        vertices = vertices[::-1]
+
+    turns = _cross(
+        vertices - np.roll(vertices, 1, axis=0),
+        np.roll(vertices, -1, axis=0) - vertices,
+    )
+    if np.all(turns >= 0):
+        return vertices[None]
+
+    triangles = []
+    remaining = list(range(len(vertices)))
+    while len(remaining) > 3:
+        for i in range(len(remaining)):
+            corner = [
+                remaining[i - 1],
+                remaining[i],
+                remaining[(i + 1) % len(remaining)],
+            ]
+            a, b, c = vertices[corner]
+            if _cross(b - a, c - b) <= 0:
+                continue  # a reflex corner can't be clipped off
+            others = vertices[[j for j in remaining if j not in corner]]
+            triangle = np.array([a, b, c])
+            edges = np.roll(triangle, -1, axis=0) - triangle
+            inside = (_cross(edges, others[:, None] - triangle) >= 0).all(axis=1)
+            if inside.any():
+                continue  # clipping this corner would cut off another vertex
+            triangles.append(triangle)
+            remaining.pop(i)
+            break
+        else:
+            raise ValueError("Can't split a polygon that isn't simple.")
+    triangles.append(vertices[remaining])
+    return np.array(triangles)
+
+
+class CollisionShape:
+    """The outline of an agent, prepared for collision tests."""
+
+    def __init__(
+        self, radius: float | None = None, pieces: np.ndarray | None = None
+    ) -> None:
+        """
+        Args:
+            radius: The radius, for circles
+            pieces: The convex pieces (see `convex_pieces`), for any other shape
+        """
+        if (radius is None) == (pieces is None):
+            raise ValueError("A collision shape is either a circle or polygons.")
+        self.radius: float | None = radius
+        self.pieces: np.ndarray | None = pieces
+
+    @classmethod
+    def from_agent_config(cls, agent_config: AgentConfig) -> "CollisionShape":
+        """The collision shape matching what the agent looks like."""
+        shape_config = resolve_shape_config(agent_config)
+        if isinstance(shape_config, CircleConfig):
+            return cls(radius=shape_config.radius)
+        return cls(pieces=convex_pieces(local_vertices(agent_config)))
+
+    @property
+    def is_circle(self) -> bool:
+        return self.radius is not None
+
+    def place(self, positions: np.ndarray, oris: np.ndarray) -> np.ndarray:
+        """The convex pieces of agents at the given positions and orientations.
+
+        Args:
+            positions: (n, 2) array of positions
+            oris: (n,) array of orientations (PsychoPy degrees)
+
+        Returns:
+            An (n, pieces, vertices per piece, 2) array
+        """
+        n_pieces, n_vertices, _ = self.pieces.shape
+        placed = transform(self.pieces.reshape(-1, 2), positions, oris)
+        return placed.reshape(len(positions), n_pieces, n_vertices, 2)
+
+
+def overlaps(
+    shape_a: CollisionShape,
+    positions_a: np.ndarray,
+    oris_a: np.ndarray | float,
+    shape_b: CollisionShape,
+    positions_b: np.ndarray,
+    oris_b: np.ndarray | float,
+    previous_positions_a: np.ndarray | None = None,
+    previous_positions_b: np.ndarray | None = None,
+) -> np.ndarray:
+    """Which pairs of agents overlap (or overlapped since the previous frame).
+
+    Positions and orientations of A and B are broadcast against each other, so
+    e.g. a whole group can be tested against a single agent at once.
+
+    Args:
+        shape_a: The shape of the A agents
+        positions_a: (n, 2) array of the A agents' positions
+        oris_a: The A agents' orientations (PsychoPy degrees)
+        shape_b: The shape of the B agents
+        positions_b: (n, 2) array of the B agents' positions
+        oris_b: The B agents' orientations (PsychoPy degrees)
+        previous_positions_a: Where the A agents were on the previous frame,
+            for a swept test
+        previous_positions_b: Where the B agents were on the previous frame,
+            for a swept test
+
+    Returns:
+        An (n,) boolean array, True for every pair that overlaps
+    """
+    positions_a, positions_b = np.broadcast_arrays(
+        np.atleast_2d(np.asarray(positions_a, dtype=float)),
+        np.atleast_2d(np.asarray(positions_b, dtype=float)),
+    )
+    n = len(positions_a)
+    oris_a = np.broadcast_to(np.asarray(oris_a, dtype=float), (n,))
+    oris_b = np.broadcast_to(np.asarray(oris_b, dtype=float), (n,))
+
+    # How far A moved relative to B since the previous frame
+    motion = np.zeros((n, 2))
+    if previous_positions_a is not None:
+        motion += positions_a - previous_positions_a
+    if previous_positions_b is not None:
+        motion -= positions_b - previous_positions_b
+
+    if shape_a.is_circle and shape_b.is_circle:
+        distances_sq = _point_segment_distance_sq(
+            positions_b, positions_a - motion, positions_a
+        )
+        return distances_sq < (shape_a.radius + shape_b.radius) ** 2
+    if shape_a.is_circle:
+        pieces_b = shape_b.place(positions_b, oris_b)
+        return _circle_polygons(positions_a, motion, shape_a.radius, pieces_b)
+    if shape_b.is_circle:
+        pieces_a = shape_a.place(positions_a, oris_a)
+        return _circle_polygons(positions_b, -motion, shape_b.radius, pieces_a)
+
+    pieces_a = shape_a.place(positions_a, oris_a)
+    pieces_b = shape_b.place(positions_b, oris_b)
+    hit = np.zeros(n, dtype=bool)
+    for piece_a in range(pieces_a.shape[1]):
+        for piece_b in range(pieces_b.shape[1]):
+            hit |= _convex_polygons(pieces_a[:, piece_a], pieces_b[:, piece_b], motion)
+    return hit
+
+
+def _point_segment_distance_sq(
+    points: np.ndarray, starts: np.ndarray, ends: np.ndarray
+) -> np.ndarray:
+    """Squared distances from points to line segments, all (..., 2) arrays."""
+    segments = ends - starts
+    lengths_sq = np.maximum((segments * segments).sum(axis=-1), 1e-12)
+    t = np.clip(((points - starts) * segments).sum(axis=-1) / lengths_sq, 0, 1)
+    offsets = points - (starts + t[..., None] * segments)
+    return (offsets * offsets).sum(axis=-1)
+
+
+def _segment_distance_sq(
+    p0: np.ndarray, p1: np.ndarray, q0: np.ndarray, q1: np.ndarray
+) -> np.ndarray:
+    """Squared distances between line segments p0-p1 and q0-q1."""
+    distances_sq = np.minimum.reduce(
+        [
+            _point_segment_distance_sq(p0, q0, q1),
+            _point_segment_distance_sq(p1, q0, q1),
+            _point_segment_distance_sq(q0, p0, p1),
+            _point_segment_distance_sq(q1, p0, p1),
+        ]
+    )
+    # Segments that cross each other (touching is covered by the distances)
+    crossing = (_cross(p1 - p0, q0 - p0) * _cross(p1 - p0, q1 - p0) < 0) & (
+        _cross(q1 - q0, p0 - q0) * _cross(q1 - q0, p1 - q0) < 0
+    )
+    return np.where(crossing, 0.0, distances_sq)
+
+
+def _circle_polygons(
+    centers: np.ndarray, motion: np.ndarray, radius: float, pieces: np.ndarray
+) -> np.ndarray:
+    """Whether circles, moving by `motion` up to `centers`, touch any of the
+    (static) convex pieces.
+
+    Args:
+        centers: (n, 2) array of the circles' current centers
+        motion: (n, 2) array of how far the circles moved
+        radius: The circles' radius
+        pieces: (n, pieces, vertices per piece, 2) array of convex polygons
+
+    Returns:
+        An (n,) boolean array
+    """
+    ends = centers[:, None, None, :]
+    starts = ends - motion[:, None, None, :]
+    edge_starts = pieces
+    edge_ends = np.roll(pieces, -1, axis=2)
+
+    # The path of the center comes within `radius` of an edge...
+    distances_sq = _segment_distance_sq(starts, ends, edge_starts, edge_ends)
+    near_edge = (distances_sq < radius**2).any(axis=(1, 2))
+    # ...or ends up inside a piece (having never crossed an edge)
+    inside = (_cross(edge_ends - edge_starts, ends - edge_starts) >= 0).all(axis=2)
+    return near_edge | inside.any(axis=1)
+
+
+def _convex_polygons(
+    polygons_a: np.ndarray, polygons_b: np.ndarray, motion: np.ndarray
+) -> np.ndarray:
+    """Whether convex polygons A, moving by `motion`, touch the (static)
+    convex polygons B, by the separating axis theorem.
+
+    Args:
+        polygons_a: (n, vertices, 2) array of A's current vertices
+        polygons_b: (n, vertices, 2) array of B's vertices
+        motion: (n, 2) array of how far A moved
+
+    Returns:
+        An (n,) boolean array
+    """
+    edges = np.concatenate(
+        [
+            np.roll(polygons_a, -1, axis=1) - polygons_a,
+            np.roll(polygons_b, -1, axis=1) - polygons_b,
+            # The area A swept over has two extra edges along its motion
+            motion[:, None, :],
+        ],
+        axis=1,
+    )
+    axes = np.stack([-edges[..., 1], edges[..., 0]], axis=-1)
+
+    projections_a = np.einsum("nkj,nvj->nkv", axes, polygons_a)
+    projections_b = np.einsum("nkj,nvj->nkv", axes, polygons_b)
+    shifts = np.einsum("nkj,nj->nk", axes, motion)
+
+    # Where A was on the previous frame projects `shift` further back
+    min_a, max_a = projections_a.min(axis=2), projections_a.max(axis=2)
+    min_a = np.minimum(min_a, min_a - shifts)
+    max_a = np.maximum(max_a, max_a - shifts)
+    min_b, max_b = projections_b.min(axis=2), projections_b.max(axis=2)
+
+    separated = (max_a < min_b) | (max_b < min_a)
+    return ~separated.any(axis=1)
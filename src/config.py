@@ -3,6 +3,7 @@ from typing import Literal
 from psychopy import monitors
 from psychopy.tools.monitorunittools import pix2deg
 import math
+import os
 
 
 @dataclass
@@ -49,6 +50,10 @@ class AgentConfig:
     face_target: bool = True  # only relevant for darts
     direction_update_window: float = math.pi / 2  # 90 degrees in radians
     direction_update_interval: tuple[int, int] = (5, 20)  # update every 5-20 frames
+    # How the agent picks its direction; any name registered in src/policies.py
+    # ("random_walk", "pursuit", "subtle_pursuit" or "flee" out of the box)
+    policy: str = "random_walk"
+    chasing_subtlety: float = math.pi / 6  # 30 degrees, only for "subtle_pursuit"
 
 
 @dataclass
@@ -68,6 +73,13 @@ class DisplayConfig:
     center_deg: tuple[float, float] = (0, 0)
     allow_gui: bool = False
     mouse_visible: bool = False
+    # Before anything is timed, stimuli are drawn offscreen for this many
+    # frames (see utils.warm_up)
+    warm_up_frames: int = 10
+    # Frames flipped before the refresh rate is measured, so the window can
+    # settle (see utils.measure_frame_period)
+    timing_warm_up_frames: int = 10
+    nominal_refresh_rate: float = 60.0  # assumed if it can't be measured
     horizontal_boundary: float = 0  # to be set later
     vertical_boundary: float = 0  # to be set later
 
@@ -88,12 +100,74 @@ class KeyConfig:
     toggle_condition: list[str] = field(default_factory=lambda: ["space"])
 
 
+@dataclass
+class SpawnConfig:
+    """Where agents may appear at the start of a trial."""
+
+    # Both are gaps between the agents' outlines (in deg), on top of the room
+    # the agents' shapes take up (see spawn.spawn_distances)
+    min_separation: float = 0.5  # between any two agents
+    sheep_safety_radius: float = 4.0  # between any agent and the sheep
+
+
+@dataclass
+class CacheConfig:
+    """On-disk cache of generated trials and spawn layouts (only used when seeded)."""
+
+    enabled: bool = True
+    directory: str = os.path.join(
+        os.path.expanduser("~"), ".cache", "wolfpack-effect-demo"
+    )
+    max_bytes: int = 2**30  # least recently used trials are evicted past this
+
+
+@dataclass
+class ReplayConfig:
+    """Settings for unattended, reproducible runs (e.g. regression tests on CI)."""
+
+    trace_path: str | None = None  # replay this mouse trace instead of the mouse
+    record_path: str | None = None  # save the session's mouse trace here
+    seed: int | None = None  # seed for every random number generator
+    # When replaying, the clock advances by one frame period per frame instead of
+    # following real time, so results don't depend on how fast the machine is.
+    # The period is the one the trace was recorded at (or this display's, if the
+    # trace doesn't store it); setting frame_rate overrides both.
+    frame_rate: float | None = None
+
+
+@dataclass
+class TelemetryConfig:
+    """Settings for the live telemetry and remote control socket (see src/telemetry.py)."""
+
+    enabled: bool = False
+    host: str = "127.0.0.1"  # only reachable from this machine
+    port: int = 8765
+    rate_hz: float = 10.0  # how often subscribers are sent a snapshot
+
+
+@dataclass
+class TrailConfig:
+    """Settings for fading motion trails behind the agents (see src/trails.py)."""
+
+    enabled: bool = False
+    length: int = 30  # how many past frames a trail covers
+    width: float = 0.1
+    opacity: float = 0.6  # right behind an agent; older parts fade out
+
+
 @dataclass
 class Config:
     display: DisplayConfig = DisplayConfig()
     wolf: AgentConfig = field(default_factory=lambda: AgentConfig())
     sheep: AgentConfig = field(default_factory=lambda: AgentConfig())
     keys: KeyConfig = KeyConfig()
+    spawn: SpawnConfig = field(default_factory=lambda: SpawnConfig())
+    replay: ReplayConfig = field(default_factory=lambda: ReplayConfig())
+    cache: CacheConfig = field(default_factory=lambda: CacheConfig())
+    telemetry: TelemetryConfig = field(default_factory=lambda: TelemetryConfig())
+    # Simulate the wolves in a separate process so that heavy simulation work
+    # can never delay drawing and flipping the window
+    simulation_process: bool = False
 
     def __post_init__(self):
         # Calculate the boundaries based on the display size
@@ -118,6 +192,8 @@ class DemoConfig(Config):
             shape_type="circle", config=CircleConfig(color="white")
         )
     )
+    # e.g. to make the chasing subtlety of the wolves' paths visible
+    trails: TrailConfig = field(default_factory=lambda: TrailConfig())
 
 
 @dataclass
@@ -140,6 +216,7 @@ class DontGetCaughtConfig(Config):
             # keep it the same color as the other distractors
             config=CircleConfig(color="white", size=1.0),
             count=1,
+            policy="pursuit",
         )
     )
 
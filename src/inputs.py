@@ -0,0 +1,145 @@
+"""Where the sheep's cursor position comes from.
+
+By default the sheep follows the mouse, but it can also replay a recorded or
+synthetic trace, so that whole sessions run unattended and reproducibly.
+"""
+
+from abc import ABC, abstractmethod
+
+import numpy as np
+from psychopy import event, visual
+
+
+class InputSource(ABC):
+    """Supplies one cursor position per frame."""
+
+    @abstractmethod
+    def get_pos(self) -> tuple[float, float] | None:
+        """The cursor position for the current frame (None if unavailable)."""
+        pass
+
+    @property
+    def finished(self) -> bool:
+        """Whether the source has run out of positions."""
+        return False
+
+
+class MouseInput(InputSource):
+    """Reads the position of the mouse, optionally recording it for later replay."""
+
+    def __init__(self, window: visual.Window, record: bool = False) -> None:
+        self.mouse = event.Mouse(win=window)
+        self.record: bool = record
+        self.history: list[tuple[float, float]] = []
+
+    def get_pos(self) -> tuple[float, float] | None:
+        pos = self.mouse.getPos()
+        if self.record and pos is not None:
+            self.history.append((float(pos[0]), float(pos[1])))
+        return pos
+
+
+class TraceInput(InputSource):
+    """Replays a trace of cursor positions, one per frame.
+
+    Once the trace runs out, the cursor stays at its last position.
+    """
+
+    def __init__(
+        self, positions: np.ndarray, frame_period: float | None = None
+    ) -> None:
+        """
+        Args:
+            positions: (n, 2) array of cursor positions, one per frame
+            frame_period: The time between frames when the trace was recorded,
+                in seconds (None if unknown)
+        """
+        self.positions: np.ndarray = np.asarray(positions, dtype=float).reshape(-1, 2)
+        if len(self.positions) == 0:
+            raise ValueError("A trace needs at least one position.")
+        self.frame_period: float | None = frame_period
+        self.frame: int = 0
+
+    @classmethod
+    def from_file(cls, path: str) -> "TraceInput":
+        """Loads a trace saved with `save_trace` (or an x,y-per-line .csv file)."""
+        return cls(*load_trace(path))
+
+    def get_pos(self) -> tuple[float, float]:
+        x, y = self.positions[min(self.frame, len(self.positions) - 1)]
+        self.frame += 1
+        return (x, y)
+
+    @property
+    def finished(self) -> bool:
+        return self.frame >= len(self.positions)
+
+
+def save_trace(
+    path: str,
+    positions: list[tuple[float, float]] | np.ndarray,
+    frame_period: float | None = None,
+) -> None:
+    """Saves a trace of cursor positions as .npz, .csv or .npy, as the path says.
+
+    .npz and .csv files also keep the frame period the trace was recorded at, so
+    that it can be replayed at the same rate; .npy files only hold the positions.
+
+    Args:
+        path: Where to save the trace
+        positions: (n, 2) array of cursor positions, one per frame
+        frame_period: The time between frames, in seconds (None if unknown)
+    """
+    positions = np.asarray(positions, dtype=float).reshape(-1, 2)
+    if path.endswith(".npz"):
+        periods = {} if frame_period is None else {"frame_period": frame_period}
+        np.savez(path, positions=positions, **periods)
+    elif path.endswith(".csv"):
+        header = "x,y"
+        if frame_period is not None:
+            header = f"frame_period={frame_period!r}\n{header}"
+        np.savetxt(path, positions, delimiter=",", header=header)
+    else:
+        np.save(path, positions)
+
+
+def load_trace(path: str) -> tuple[np.ndarray, float | None]:
+    """Loads a trace of cursor positions saved with `save_trace`.
+
+    Returns:
+        The (n, 2) array of positions, and the frame period the trace was
+        recorded at (None if the file doesn't say)
+    """
+    if path.endswith(".npz"):
+        with np.load(path) as trace:
+            frame_period = trace.get("frame_period")
+            positions = trace["positions"]
+        return positions, None if frame_period is None else float(frame_period)
+    if path.endswith(".csv"):
+        frame_period = None
+        with open(path) as file:
+            for line in file:
+                if not line.startswith("#"):
+                    break
+                key, _, value = line.lstrip("# ").partition("=")
+                if key == "frame_period":
+                    frame_period = float(value)
+        return np.loadtxt(path, delimiter=",", ndmin=2), frame_period
+    return np.load(path), None
+
+
+def circular_trace(
+    n_frames: int,
+    radius: float = 5.0,
+    frames_per_cycle: int = 240,
+    center: tuple[float, float] = (0.0, 0.0),
+) -> np.ndarray:
+    """A synthetic trace that circles around the center at constant speed.
+
+    Returns:
+        An (n_frames, 2) array of cursor positions
+    """
+    angles = 2 * np.pi * np.arange(n_frames) / frames_per_cycle
+    return np.column_stack(
+        [center[0] + radius * np.cos(angles), center[1] + radius * np.sin(angles)]
+    )
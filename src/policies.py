@@ -0,0 +1,92 @@
+"""Motion policies decide where the agents of an `AgentGroup` head next.
+
+A policy is evaluated once per frame for every agent in a group at once, so a
+new condition only needs a registered policy and a config change.
+"""
+
+from typing import TYPE_CHECKING, Callable
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from .simulation import AgentGroup
+
+# Policies update `group.directions` in place. `due` marks the agents whose
+# direction update interval has elapsed this frame.
+MotionPolicy = Callable[["AgentGroup", tuple[float, float], np.ndarray], None]
+
+POLICIES: dict[str, MotionPolicy] = {}
+
+
+def register_policy(name: str) -> Callable[[MotionPolicy], MotionPolicy]:
+    """Decorator that makes a policy selectable by name from `AgentConfig.policy`."""
+
+    def decorator(policy: MotionPolicy) -> MotionPolicy:
+        POLICIES[name] = policy
+        return policy
+
+    return decorator
+
+
+def get_policy(name: str) -> MotionPolicy:
+    """Looks up a registered policy.
+
+    Raises:
+        ValueError: If no policy is registered under that name
+    """
+    if name not in POLICIES:
+        raise ValueError(f"Unknown motion policy: {name}")
+    return POLICIES[name]
+
+
+def headings_to_target(
+    group: "AgentGroup", target_pos: tuple[float, float]
+) -> np.ndarray:
+    """The direction (in radians, counter-clockwise from the x-axis) from every
+    agent in the group to the target."""
+    return np.arctan2(
+        target_pos[1] - group.positions[:, 1], target_pos[0] - group.positions[:, 0]
+    )
+
+
+@register_policy("random_walk")
+def random_walk(
+    group: "AgentGroup", target_pos: tuple[float, float], due: np.ndarray
+) -> None:
+    """Turns by a random angle within the update window, centered on the current
+    direction (the wolves' default motion)."""
+    max_deviation = group.direction_update_window / 2
+    angle_changes = group.rng.uniform(
+        -max_deviation, max_deviation, np.count_nonzero(due)
+    )
+    group.directions[due] = (group.directions[due] + angle_changes) % (2 * np.pi)
+
+
+@register_policy("pursuit")
+def pursuit(
+    group: "AgentGroup", target_pos: tuple[float, float], due: np.ndarray
+) -> None:
+    """Heads straight for the target on every frame (heat-seeking)."""
+    group.directions[:] = headings_to_target(group, target_pos)
+
+
+@register_policy("subtle_pursuit")
+def subtle_pursuit(
+    group: "AgentGroup", target_pos: tuple[float, float], due: np.ndarray
+) -> None:
+    """Heads in a random direction that deviates by at most the chasing
+    subtlety from the direction to the target (Gao, Newman & Scholl, 2009), so a
+    subtlety of 30 degrees gives a 60 degree window. A subtlety of 0 is perfect
+    pursuit; larger subtleties make the chase harder to detect."""
+    max_deviation = group.chasing_subtlety
+    angle_changes = group.rng.uniform(
+        -max_deviation, max_deviation, np.count_nonzero(due)
+    )
+    headings = headings_to_target(group, target_pos)[due]
+    group.directions[due] = (headings + angle_changes) % (2 * np.pi)
+
+
+@register_policy("flee")
+def flee(group: "AgentGroup", target_pos: tuple[float, float], due: np.ndarray) -> None:
+    """Heads straight away from the target on every frame."""
+    group.directions[:] = (headings_to_target(group, target_pos) + np.pi) % (2 * np.pi)
@@ -0,0 +1,349 @@
+"""Offscreen rendering of agent displays into NumPy frame buffers.
+
+Nothing here touches OpenGL, so frames can be produced headless and in
+parallel (e.g. to export videos for publications or online studies). The
+geometry and colors match what `Agent._create_circle`/`Agent._create_dart`
+draw in a live PsychoPy window.
+"""
+
+import os
+import shutil
+import subprocess
+from dataclasses import dataclass
+from functools import cached_property
+from multiprocessing import Pool, shared_memory
+from typing import Iterator
+
+import numpy as np
+from PIL import Image
+from psychopy.colors import Color
+
+from .config import AgentConfig, DisplayConfig
+from .shapes import local_vertices, resolve_shape_config, transform
+
+
+def to_rgb255(color: tuple[float, float, float] | str) -> np.ndarray:
+    """Converts a PsychoPy color (name, hex or -1..1 rgb tuple) to RGB bytes."""
+    if isinstance(color, str):
+        rgb255 = Color(color).rgb255
+    else:
+        rgb255 = Color(color, space="rgb").rgb255
+    return np.clip(np.round(rgb255[:3]), 0, 255).astype(np.uint8)
+
+
+@dataclass
+class Canvas:
+    """Maps display units (deg, origin at the center, y up) onto pixels."""
+
+    size_px: tuple[int, int]
+    pix_per_unit: float
+    bg_color: np.ndarray
+
+    @classmethod
+    def from_display_config(cls, display: DisplayConfig) -> "Canvas":
+        return cls(
+            size_px=display.resolution_px,
+            pix_per_unit=display.resolution_px[0] / display.width_deg,
+            bg_color=to_rgb255(display.bg_color),
+        )
+
+    @property
+    def shape(self) -> tuple[int, int, int]:
+        """The shape of a frame buffer for this canvas (rows, columns, RGB)."""
+        width, height = self.size_px
+        return (height, width, 3)
+
+    @cached_property
+    def background(self) -> np.ndarray:
+        """An empty frame, so clearing a buffer is a plain memory copy."""
+        background = np.empty(self.shape, dtype=np.uint8)
+        background[...] = self.bg_color
+        return background
+
+    def to_pixels(self, points: np.ndarray) -> np.ndarray:
+        """Converts (..., 2) points in display units to (column, row) pixel coordinates."""
+        width, height = self.size_px
+        pixels = np.empty_like(points, dtype=float)
+        pixels[..., 0] = width / 2 + points[..., 0] * self.pix_per_unit
+        pixels[..., 1] = height / 2 - points[..., 1] * self.pix_per_unit
+        return pixels
+
+
+@dataclass
+class Sprite:
+    """The outline and fill color of a single agent's stimulus."""
+
+    vertices: np.ndarray
+    color: np.ndarray
+
+    @classmethod
+    def from_agent_config(cls, agent_config: AgentConfig) -> "Sprite":
+        return cls(
+            vertices=local_vertices(agent_config),
+            color=to_rgb255(resolve_shape_config(agent_config).color),
+        )
+
+
+def fill_polygon(frame: np.ndarray, polygon: np.ndarray, color: np.ndarray) -> None:
+    """Fills a (possibly concave) polygon in place using the even-odd rule.
+
+    A pixel is filled when its center lies inside the polygon, which is how
+    OpenGL rasterizes PsychoPy's (non-multisampled) shapes.
+
+    Args:
+        frame: The (rows, columns, 3) frame buffer to draw onto
+        polygon: (n, 2) array of vertices in pixel coordinates
+        color: RGB bytes to fill with
+    """
+    n_rows, n_cols = frame.shape[:2]
+    col_min = max(int(np.floor(polygon[:, 0].min())), 0)
+    col_max = min(int(np.ceil(polygon[:, 0].max())), n_cols)
+    row_min = max(int(np.floor(polygon[:, 1].min())), 0)
+    row_max = min(int(np.ceil(polygon[:, 1].max())), n_rows)
+    if col_min >= col_max or row_min >= row_max:
+        return  # entirely off screen
+
+    xs = np.arange(col_min, col_max) + 0.5
+    ys = np.arange(row_min, row_max) + 0.5
+    x0, y0 = polygon[:, 0], polygon[:, 1]
+    x1, y1 = np.roll(x0, -1), np.roll(y0, -1)
+
+    # For every (edge, row), does the edge cross the row's scanline, and where?
+    crosses = (y0[:, None] > ys) != (y1[:, None] > ys)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        x_cross = x0[:, None] + (ys - y0[:, None]) * ((x1 - x0) / (y1 - y0))[:, None]
+    x_cross = np.where(crosses, x_cross, -np.inf)
+
+    # A pixel is inside if an odd number of crossings lie to its right
+    n_crossings = (xs[None, None, :] < x_cross[:, :, None]).sum(axis=0)
+    inside = (n_crossings % 2).astype(bool)
+    frame[row_min:row_max, col_min:col_max][inside] = color
+
+
+def render_frame(
+    canvas: Canvas,
+    sprites: list[Sprite],
+    positions: np.ndarray,
+    oris: np.ndarray,
+    out: np.ndarray | None = None,
+) -> np.ndarray:
+    """Rasterizes one frame of a display.
+
+    Sprites are drawn in order, so later agents end up on top of earlier ones
+    (the same as calling `draw()` on them in that order).
+
+    Args:
+        canvas: The pixel mapping and background
+        sprites: One sprite per agent
+        positions: (n_agents, 2) array of positions in display units
+        oris: (n_agents,) array of orientations in degrees
+        out: Optional frame buffer to draw into (avoids an allocation)
+
+    Returns:
+        The (rows, columns, 3) uint8 frame buffer
+    """
+    if out is None:
+        out = np.empty(canvas.shape, dtype=np.uint8)
+    np.copyto(out, canvas.background)
+
+    for sprite, pos, ori in zip(sprites, positions, oris):
+        polygon = canvas.to_pixels(transform(sprite.vertices, pos, ori))
+        fill_polygon(out, polygon, sprite.color)
+
+    return out
+
+
+#########################
+#### Parallel export ####
+#########################
+
+# Per-process state, set once by `_init_worker` so that tasks stay tiny
+_worker_state: dict = {}
+
+
+def _init_worker(
+    canvas: Canvas,
+    sprites: list[Sprite],
+    positions: np.ndarray,
+    oris: np.ndarray,
+    shm_name: str | None = None,
+    n_slots: int = 0,
+) -> None:
+    _worker_state.update(canvas=canvas, sprites=sprites, positions=positions, oris=oris)
+    if shm_name is not None:
+        shm = shared_memory.SharedMemory(name=shm_name)
+        _worker_state["shm"] = shm  # keep the mapping alive
+        _worker_state["slots"] = np.ndarray(
+            (n_slots, *canvas.shape), dtype=np.uint8, buffer=shm.buf
+        )
+
+
+def _render_to_slot(frame_index: int, slot: int) -> None:
+    state = _worker_state
+    render_frame(
+        state["canvas"],
+        state["sprites"],
+        state["positions"][frame_index],
+        state["oris"][frame_index],
+        out=state["slots"][slot],
+    )
+
+
+def _render_to_file(frame_index: int, path: str) -> None:
+    state = _worker_state
+    frame = render_frame(
+        state["canvas"],
+        state["sprites"],
+        state["positions"][frame_index],
+        state["oris"][frame_index],
+    )
+    Image.fromarray(frame).save(path)
+
+
+def iter_frames(
+    canvas: Canvas,
+    sprites: list[Sprite],
+    positions: np.ndarray,
+    oris: np.ndarray,
+    processes: int | None = None,
+) -> Iterator[np.ndarray]:
+    """Renders frames in parallel and yields them in order.
+
+    Workers render straight into a ring of shared-memory frame buffers, so no
+    pixels are pickled between processes. Each yielded frame is a view into
+    that ring and is only valid until the next one is requested.
+
+    Args:
+        canvas: The pixel mapping and background
+        sprites: One sprite per agent
+        positions: (n_frames, n_agents, 2) array of positions
+        oris: (n_frames, n_agents) array of orientations in degrees
+        processes: Number of worker processes (defaults to the CPU count)
+
+    Yields:
+        (rows, columns, 3) uint8 frame buffers
+    """
+    processes = processes or os.cpu_count() or 1
+    n_frames = len(positions)
+    n_slots = 2 * processes
+    frame_bytes = int(np.prod(canvas.shape))
+    shm = shared_memory.SharedMemory(create=True, size=n_slots * frame_bytes)
+    slots = np.ndarray((n_slots, *canvas.shape), dtype=np.uint8, buffer=shm.buf)
+
+    try:
+        with Pool(
+            processes,
+            initializer=_init_worker,
+            initargs=(canvas, sprites, positions, oris, shm.name, n_slots),
+        ) as pool:
+            # Keep every slot busy; a slot is reused only once its frame is consumed
+            pending = [
+                pool.apply_async(_render_to_slot, (i, i % n_slots))
+                for i in range(min(n_slots, n_frames))
+            ]
+            for i in range(n_frames):
+                pending[i % n_slots].get()
+                yield slots[i % n_slots]
+                next_frame = i + n_slots
+                if next_frame < n_frames:
+                    pending[i % n_slots] = pool.apply_async(
+                        _render_to_slot, (next_frame, i % n_slots)
+                    )
+    finally:
+        del slots
+        shm.close()
+        shm.unlink()
+
+
+def export_image_sequence(
+    directory: str,
+    canvas: Canvas,
+    sprites: list[Sprite],
+    positions: np.ndarray,
+    oris: np.ndarray,
+    processes: int | None = None,
+    filename: str = "frame_{:06d}.png",
+) -> list[str]:
+    """Renders every frame to an image file, with each worker writing its own files.
+
+    Args:
+        directory: Where to write the images (created if missing)
+        canvas: The pixel mapping and background
+        sprites: One sprite per agent
+        positions: (n_frames, n_agents, 2) array of positions
+        oris: (n_frames, n_agents) array of orientations in degrees
+        processes: Number of worker processes (defaults to the CPU count)
+        filename: Format string for each frame's file name
+
+    Returns:
+        The paths of the written images, in frame order
+    """
+    os.makedirs(directory, exist_ok=True)
+    paths = [os.path.join(directory, filename.format(i)) for i in range(len(positions))]
+    with Pool(
+        processes or os.cpu_count() or 1,
+        initializer=_init_worker,
+        initargs=(canvas, sprites, positions, oris),
+    ) as pool:
+        pool.starmap(_render_to_file, enumerate(paths), chunksize=16)
+    return paths
+
+
+def export_video(
+    path: str,
+    canvas: Canvas,
+    sprites: list[Sprite],
+    positions: np.ndarray,
+    oris: np.ndarray,
+    fps: float = 60,
+    processes: int | None = None,
+    encoder_args: list[str] | None = None,
+) -> None:
+    """Renders every frame in parallel and streams them to an ffmpeg encoder.
+
+    Args:
+        path: The video file to write
+        canvas: The pixel mapping and background
+        sprites: One sprite per agent
+        positions: (n_frames, n_agents, 2) array of positions
+        oris: (n_frames, n_agents) array of orientations in degrees
+        fps: Frame rate of the video
+        processes: Number of worker processes (defaults to the CPU count)
+        encoder_args: ffmpeg output options (defaults to H.264)
+
+    Raises:
+        RuntimeError: If ffmpeg is not installed or fails to encode
+    """
+    ffmpeg = shutil.which("ffmpeg")
+    if ffmpeg is None:
+        raise RuntimeError("ffmpeg is required to export videos.")
+
+    if encoder_args is None:
+        encoder_args = [
+            "-c:v", "libx264",
+            "-preset", "veryfast",
+            "-pix_fmt", "yuv420p",
+            # yuv420p needs even dimensions
+            "-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2",
+        ]  # fmt: skip
+
+    width, height = canvas.size_px
+    command = [
+        ffmpeg, "-y", "-loglevel", "error",
+        "-f", "rawvideo", "-pix_fmt", "rgb24",
+        "-s", f"{width}x{height}", "-r", str(fps),
+        "-i", "-",
+        *encoder_args,
+        path,
+    ]  # fmt: skip
+
+    encoder = subprocess.Popen(command, stdin=subprocess.PIPE)
+    assert encoder.stdin is not None
+    try:
+        for frame in iter_frames(canvas, sprites, positions, oris, processes):
+            encoder.stdin.write(frame.data)
+    finally:
+        encoder.stdin.close()
+        return_code = encoder.wait()
+    if return_code != 0:
+        raise RuntimeError(f"ffmpeg exited with code {return_code}.")
@@ -0,0 +1,91 @@
+import numpy as np
+from .config import AgentConfig, CircleConfig, DartConfig
+
+# Number of edges PsychoPy uses for visual.Circle by default
+CIRCLE_EDGES = 32
+
+
+def resolve_shape_config(agent_config: AgentConfig) -> CircleConfig | DartConfig:
+    """Returns the shape configuration matching the agent's shape type.
+
+    Args:
+        agent_config: The agent's configuration
+
+    Returns:
+        The agent's shape config, coerced to the right type if necessary
+
+    Raises:
+        ValueError: If the shape type is unknown
+    """
+    shape_config = agent_config.config
+    if agent_config.shape_type == "circle":
+        if not isinstance(shape_config, CircleConfig):
+            # If somehow it's not a CircleConfig, create one with the specified color
+            shape_config = CircleConfig(
+                color=shape_config.color, size=shape_config.size
+            )
+        return shape_config
+
+    if agent_config.shape_type == "dart":
+        if not isinstance(shape_config, DartConfig):
+            # If somehow it's not a DartConfig, create one with the specified color
+            shape_config = DartConfig(color=shape_config.color, size=shape_config.size)
+        return shape_config
+
+    raise ValueError(f"Unknown shape type: {agent_config.shape_type}")
+
+
+def local_vertices(agent_config: AgentConfig) -> np.ndarray:
+    """The outline of the agent's shape, as PsychoPy would draw it.
+
+    Args:
+        agent_config: The agent's configuration
+
+    Returns:
+        An (n, 2) array of vertices in display units, relative to the agent's
+        position and at an orientation of 0
+    """
+    shape_config = resolve_shape_config(agent_config)
+    if isinstance(shape_config, CircleConfig):
+        # Same construction as visual.Circle: starts at the top, goes clockwise
+        angles = np.arange(CIRCLE_EDGES) * 2 * np.pi / CIRCLE_EDGES
+        return shape_config.radius * np.column_stack([np.sin(angles), np.cos(angles)])
+
+    vertices = np.asarray(shape_config.vertices, dtype=float) * shape_config.size
+    # The closing vertex is only there for PsychoPy's benefit
+    if len(vertices) > 1 and np.allclose(vertices[0], vertices[-1]):
+        vertices = vertices[:-1]
+    return vertices
+
+
+def bounding_radius(agent_config: AgentConfig) -> float:
+    """How far the agent's outline reaches from its center, in any orientation."""
+    return float(np.linalg.norm(local_vertices(agent_config), axis=1).max())
+
+
+def transform(
+    vertices: np.ndarray, pos: np.ndarray, ori: np.ndarray | float
+) -> np.ndarray:
+    """Places local vertices at the given position(s) and orientation(s).
+
+    Orientations follow PsychoPy's convention (degrees, clockwise positive).
+
+    Args:
+        vertices: (n, 2) array of local vertices
+        pos: (..., 2) array of positions
+        ori: Orientation(s) in degrees, broadcastable to pos[..., 0]
+
+    Returns:
+        A (..., n, 2) array of transformed vertices
+    """
+    pos = np.asarray(pos, dtype=float)
+    theta = np.radians(np.asarray(ori, dtype=float))[..., None]
+    cos, sin = np.cos(theta), np.sin(theta)
+    x, y = vertices[:, 0], vertices[:, 1]
+    return np.stack(
+        [
+            x * cos + y * sin + pos[..., 0, None],
+            -x * sin + y * cos + pos[..., 1, None],
+        ],
+        axis=-1,
+    )
@@ -0,0 +1,227 @@
+"""Runs the agent simulation in a worker process, decoupled from rendering.
+
+The simulation publishes each frame's positions and orientations into a
+double-buffered `multiprocessing.shared_memory` block. The render process only
+ever reads the latest complete frame (through zero-copy views), so a slow
+simulation step shows up as a repeated frame rather than a missed flip.
+"""
+
+import multiprocessing
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+from .config import config, AgentConfig
+from .simulation import AgentGroup
+
+# Layout of the header at the start of the shared block (all float64)
+_PUBLISHED = 0  # index of the latest complete frame (-1 before the first one)
+_ACQUIRED = 1  # index of the frame the reader is currently using
+_STOP = 2  # set by the reader to ask the writer to exit
+_TARGET = slice(3, 5)  # x, y of the target (sheep), written by the reader
+_HEADER_SIZE = 5
+
+
+class SharedFrameBuffer:
+    """Two frame slots of (x, y, ori) per agent, plus a small control header.
+
+    There is exactly one writer and one reader. The writer fills frame `n` into
+    slot `n % 2` and only does so once the reader has acquired frame `n - 1`, so
+    the slot the reader is using is never overwritten. The reader never waits.
+    """
+
+    def __init__(self, n_agents: int, n_controls: int = 0, name: str | None = None):
+        self.n_agents: int = n_agents
+        self.n_controls: int = n_controls
+        n_values = _HEADER_SIZE + n_controls + 2 * n_agents * 3
+        if name is None:
+            self.shm = shared_memory.SharedMemory(create=True, size=n_values * 8)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+        self.owner: bool = name is None
+
+        values = np.ndarray((n_values,), dtype=np.float64, buffer=self.shm.buf)
+        self.header: np.ndarray = values[:_HEADER_SIZE]
+        self.controls: np.ndarray = values[_HEADER_SIZE : _HEADER_SIZE + n_controls]
+        self.slots: np.ndarray = values[_HEADER_SIZE + n_controls :].reshape(
+            2, n_agents, 3
+        )
+        if self.owner:
+            values[:] = 0
+            self.header[_PUBLISHED] = -1
+            self.header[_ACQUIRED] = -1
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    ################
+    #### Writer ####
+    ################
+
+    def can_write(self) -> bool:
+        """Whether the next frame can be written without touching the reader's slot."""
+        return self.header[_ACQUIRED] >= self.header[_PUBLISHED]
+
+    def back_slot(self) -> np.ndarray:
+        """The (n_agents, 3) slot for the next frame; only valid if `can_write()`."""
+        return self.slots[int(self.header[_PUBLISHED] + 1) % 2]
+
+    def publish(self) -> None:
+        """Makes the back slot the latest complete frame."""
+        self.header[_PUBLISHED] += 1
+
+    ################
+    #### Reader ####
+    ################
+
+    def latest(self) -> tuple[int, np.ndarray] | None:
+        """Acquires the latest complete frame.
+
+        Returns:
+            The frame's index and an (n_agents, 3) view of (x, y, ori) that stays
+            valid until the next call, or None if nothing has been published yet
+        """
+        frame = int(self.header[_PUBLISHED])
+        if frame < 0:
+            return None
+        self.header[_ACQUIRED] = frame
+        return frame, self.slots[frame % 2]
+
+    @property
+    def target(self) -> np.ndarray:
+        return self.header[_TARGET]
+
+    @property
+    def stop_requested(self) -> bool:
+        return bool(self.header[_STOP])
+
+    def request_stop(self) -> None:
+        self.header[_STOP] = 1
+
+    def close(self) -> None:
+        # Views into the buffer must be released before it can be closed
+        del self.header, self.controls, self.slots
+        try:
+            self.shm.close()
+        except BufferError:
+            pass  # a caller still holds a view; the mapping goes away with it
+        if self.owner:
+            self.shm.unlink()
+
+
+def _run_simulation(
+    buffer_name: str,
+    groups: list[tuple[AgentConfig, int]],
+    positions: np.ndarray | None,
+    seed: int | None,
+    boundaries: tuple[float, float],
+) -> None:
+    """Entry point of the simulation process."""
+    n_agents = sum(count for _, count in groups)
+    buffer = SharedFrameBuffer(n_agents, n_controls=len(groups), name=buffer_name)
+    rng = np.random.default_rng(seed)
+
+    agent_groups = []
+    start = 0
+    for agent_config, count in groups:
+        group_positions = (
+            None if positions is None else positions[start : start + count]
+        )
+        agent_groups.append(
+            AgentGroup(agent_config, count, group_positions, rng, boundaries)
+        )
+        start += count
+
+    slot = None
+    try:
+        while not buffer.stop_requested:
+            if not buffer.can_write():
+                time.sleep(0.0005)  # the reader hasn't caught up yet
+                continue
+
+            target = tuple(buffer.target)
+            slot = buffer.back_slot()
+            start = 0
+            for i, group in enumerate(agent_groups):
+                group.face_target = bool(buffer.controls[i])
+                group.step(target)
+                slot[start : start + group.count, :2] = group.positions
+                slot[start : start + group.count, 2] = group.oris
+                start += group.count
+            buffer.publish()
+    finally:
+        del slot
+        buffer.close()
+
+
+class SimulationProcess:
+    """Simulates groups of wolves in a separate process.
+
+    The render loop sets the target with `set_target`, reads the latest frame
+    with `latest`, and never blocks on the simulation.
+    """
+
+    def __init__(
+        self,
+        groups: list[tuple[AgentConfig, int]],
+        positions: np.ndarray | None = None,
+        seed: int | None = None,
+    ) -> None:
+        """
+        Args:
+            groups: (agent config, count) for every group to simulate
+            positions: Optional (n_agents, 2) starting positions, in group order
+            seed: Seed for the simulation's random number generator
+        """
+        self.groups: list[tuple[AgentConfig, int]] = groups
+        self.n_agents: int = sum(count for _, count in groups)
+        self.buffer: SharedFrameBuffer = SharedFrameBuffer(
+            self.n_agents, n_controls=len(groups)
+        )
+        for i, (agent_config, _) in enumerate(groups):
+            self.buffer.controls[i] = agent_config.face_target
+
+        boundaries = (
+            config.display.horizontal_boundary,
+            config.display.vertical_boundary,
+        )
+        self.process = multiprocessing.Process(
+            target=_run_simulation,
+            args=(self.buffer.name, groups, positions, seed, boundaries),
+            daemon=True,
+        )
+
+    def start(self, target_pos: tuple[float, float], timeout: float = 5.0) -> None:
+        """Starts the simulation and waits for its first frame.
+
+        Raises:
+            RuntimeError: If the simulation doesn't produce a frame in time
+        """
+        self.set_target(target_pos)
+        self.process.start()
+        deadline = time.perf_counter() + timeout
+        while self.buffer.header[_PUBLISHED] < 0:
+            if not self.process.is_alive() or time.perf_counter() > deadline:
+                raise RuntimeError("Simulation process failed to start.")
+            time.sleep(0.001)
+
+    def set_target(self, target_pos: tuple[float, float]) -> None:
+        self.buffer.target[:] = target_pos
+
+    def set_face_target(self, group_index: int, face_target: bool) -> None:
+        self.buffer.controls[group_index] = face_target
+
+    def latest(self) -> tuple[np.ndarray, np.ndarray]:
+        """Zero-copy views of the latest (n_agents, 2) positions and (n_agents,) oris."""
+        frame = self.buffer.latest()
+        assert frame is not None, "Simulation hasn't been started."
+        _, values = frame
+        return values[:, :2], values[:, 2]
+
+    def stop(self) -> None:
+        self.buffer.request_stop()
+        self.process.join(timeout=1.0)
+        if self.process.is_alive():
+            self.process.terminate()
+        self.buffer.close()
@@ -0,0 +1,148 @@
+"""Headless, batched versions of the agents' motion rules.
+
+An `AgentGroup` moves a whole group of wolves with NumPy arrays instead of one
+`Wolf` (and one PsychoPy stimulus) per agent, so it can run without a window,
+e.g. in a separate simulation process.
+"""
+
+import numpy as np
+from .config import config, AgentConfig, SpawnConfig
+from .policies import MotionPolicy, get_policy
+from .spawn import spawn_distances, spawn_layout
+
+
+class AgentGroup:
+    """A group of wolves that share an `AgentConfig`.
+
+    Each step lets the group's motion policy (see `src.policies`) pick new
+    directions, then follows the same rules as `Wolf.update`: move along the
+    current direction, bounce off the boundaries, and face (or face 90 degrees
+    away from) the target. With the default "random_walk" policy, the group
+    moves like a list of wandering wolves.
+    """
+
+    def __init__(
+        self,
+        agent_config: AgentConfig,
+        count: int,
+        positions: np.ndarray | None = None,
+        rng: np.random.Generator | None = None,
+        boundaries: tuple[float, float] | None = None,
+    ) -> None:
+        self.rng: np.random.Generator = (
+            rng if rng is not None else np.random.default_rng()
+        )
+        if boundaries is None:
+            boundaries = (
+                config.display.horizontal_boundary,
+                config.display.vertical_boundary,
+            )
+        self.boundaries: np.ndarray = np.asarray(boundaries, dtype=float)
+
+        if positions is None:
+            positions = self.rng.uniform(-self.boundaries, self.boundaries, (count, 2))
+        self.positions: np.ndarray = np.array(positions, dtype=float).reshape(count, 2)
+
+        self.count: int = count
+        self.speed: float = agent_config.speed
+        self.direction_update_window: float = agent_config.direction_update_window
+        self.direction_update_interval: tuple[int, int] = (
+            agent_config.direction_update_interval
+        )
+        self.face_target: bool = agent_config.face_target
+        self.chasing_subtlety: float = agent_config.chasing_subtlety
+        self.policy: MotionPolicy = get_policy(agent_config.policy)
+
+        self.directions: np.ndarray = self.rng.uniform(0, 2 * np.pi, count)
+        self.oris: np.ndarray = np.zeros(count)
+        self.frame_counters: np.ndarray = np.zeros(count, dtype=int)
+        self.frames_until_direction_update: np.ndarray = self.rng.integers(
+            *self.direction_update_interval, size=count
+        )
+
+    def step(self, target_pos: tuple[float, float]) -> None:
+        """Advances every agent in the group by one frame.
+
+        Args:
+            target_pos (tuple): The x, y coordinate of the target
+        """
+        # Let the policy pick new directions (random walkers only turn when due)
+        self.frame_counters += 1
+        due = self.frame_counters >= self.frames_until_direction_update
+        self.policy(self, target_pos, due)
+        n_due = np.count_nonzero(due)
+        if n_due:
+            self.frames_until_direction_update[due] = self.rng.integers(
+                *self.direction_update_interval, size=n_due
+            )
+            self.frame_counters[due] = 0
+
+        # Update positions
+        self.positions[:, 0] += np.cos(self.directions) * self.speed
+        self.positions[:, 1] += np.sin(self.directions) * self.speed
+
+        # Bounce off the boundaries in the opposite direction, then keep in bounds
+        hit_x = np.abs(self.positions[:, 0]) > self.boundaries[0]
+        hit_y = np.abs(self.positions[:, 1]) > self.boundaries[1]
+        self.directions[hit_x] = np.pi - self.directions[hit_x]
+        self.directions[hit_y] = -self.directions[hit_y]
+        np.clip(self.positions, -self.boundaries, self.boundaries, out=self.positions)
+
+        self._update_oris(target_pos)
+
+    def _update_oris(self, target_pos: tuple[float, float]) -> None:
+        """Points every agent towards (or 90 degrees away from) the target,
+        in PsychoPy's orientation system (0° is vertical, clockwise is positive)."""
+        dx = target_pos[0] - self.positions[:, 0]
+        dy = target_pos[1] - self.positions[:, 1]
+        self.oris[:] = (90 - np.degrees(np.arctan2(dy, dx))) % 360
+        if not self.face_target:
+            self.oris += 90
+
+
+def generate_trial(
+    agent_config: AgentConfig,
+    count: int,
+    n_frames: int,
+    seed: int | None,
+    spawn_config: SpawnConfig,
+    target_pos: tuple[float, float] = (0.0, 0.0),
+    boundaries: tuple[float, float] | None = None,
+) -> dict[str, np.ndarray]:
+    """Simulates a whole trial of one group of agents offline.
+
+    Args:
+        agent_config: The agents' configuration
+        count: The number of agents
+        n_frames: The number of frames to simulate
+        seed: Seed for the random number generator
+        spawn_config: The gaps to keep between the agents' outlines (and from
+            the target) when they spawn
+        target_pos: The (stationary) position of the target
+        boundaries: Half-width and half-height of the display area
+
+    Returns:
+        The spawn layout ("spawn", (count, 2)), and the positions
+        ("positions", (n_frames, count, 2)) and orientations
+        ("oris", (n_frames, count)) on every frame
+    """
+    rng = np.random.default_rng(seed)
+    min_distance, safety_radius = spawn_distances([agent_config], spawn_config)
+    (spawn,) = spawn_layout(
+        [count],
+        min_distance,
+        boundaries,
+        safe_pos=target_pos,
+        safety_radius=safety_radius,
+        rng=rng,
+    )
+    group = AgentGroup(agent_config, count, spawn, rng, boundaries)
+
+    positions = np.empty((n_frames, count, 2))
+    oris = np.empty((n_frames, count))
+    for frame in range(n_frames):
+        group.step(target_pos)
+        positions[frame] = group.positions
+        oris[frame] = group.oris
+
+    return {"spawn": spawn, "positions": positions, "oris": oris}
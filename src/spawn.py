@@ -0,0 +1,184 @@
+"""Spawn layouts where no two agents start on top of each other.
+
+Positions come from Poisson-disk sampling, accelerated with a background grid
+whose cells can hold at most one point. Cells are filled in 9 interleaved
+phases; cells of the same phase are far enough apart that all their candidates
+can be drawn and checked at once, so the sampler is fully vectorized.
+"""
+
+import numpy as np
+from .config import config, AgentConfig, SpawnConfig
+from .shapes import bounding_radius
+
+# Neighboring cells that can hold a point closer than the minimum distance
+# (the 5x5 block around a cell, minus the cell itself and the far corners)
+_NEIGHBOR_OFFSETS = np.array(
+    [
+        (di, dj)
+        for di in range(-2, 3)
+        for dj in range(-2, 3)
+        if (di, dj) != (0, 0) and abs(di) + abs(dj) < 4
+    ]
+)
+_N_PHASES = 3  # per axis, so cells of one phase are >= 2 cells apart
+
+
+def poisson_disk_sample(
+    min_distance: float,
+    boundaries: tuple[float, float] | None = None,
+    rng: np.random.Generator | None = None,
+    n_rounds: int = 3,
+    n_candidates: int = 10,
+) -> np.ndarray:
+    """Draws points that are at least `min_distance` apart from each other.
+
+    Args:
+        min_distance: The minimum distance between any two points
+        boundaries: Half-width and half-height of the (centered) area to fill
+            (defaults to the display boundaries)
+        rng: Random number generator to use
+        n_rounds: How often to revisit the cells that are still empty
+        n_candidates: How many candidates to try per empty cell and round;
+            more rounds and candidates pack the points more densely
+
+    Returns:
+        An (n, 2) array of points, in random order
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    if boundaries is None:
+        boundaries = (
+            config.display.horizontal_boundary,
+            config.display.vertical_boundary,
+        )
+    half_width, half_height = boundaries
+
+    # Cells this small can hold at most one point each
+    cell_size = min_distance / np.sqrt(2)
+    n_cols = max(int(np.ceil(2 * half_width / cell_size)), 1)
+    n_rows = max(int(np.ceil(2 * half_height / cell_size)), 1)
+
+    # Padded by 2 empty (NaN) cells on each side so neighbors are always in range
+    grid = np.full((n_rows + 4, n_cols + 4, 2), np.nan)
+    rows, cols = np.mgrid[0:n_rows, 0:n_cols]
+    phases = [
+        (
+            rows[i::_N_PHASES, j::_N_PHASES].ravel(),
+            cols[i::_N_PHASES, j::_N_PHASES].ravel(),
+        )
+        for i in range(_N_PHASES)
+        for j in range(_N_PHASES)
+    ]
+
+    for _ in range(n_rounds):
+        # Shuffling the phase order avoids favoring the first phases' cells
+        for phase in rng.permutation(len(phases)):
+            phase_rows, phase_cols = phases[phase]
+            empty = np.isnan(grid[phase_rows + 2, phase_cols + 2, 0])
+            cell_rows, cell_cols = phase_rows[empty], phase_cols[empty]
+            phases[phase] = (cell_rows, cell_cols)
+            if len(cell_rows) == 0:
+                continue
+
+            # Uniform candidates within each cell
+            cell_origins = np.column_stack(
+                [
+                    -half_width + cell_cols * cell_size,
+                    -half_height + cell_rows * cell_size,
+                ]
+            )
+            candidates = (
+                cell_origins[:, None, :]
+                + rng.random((len(cell_rows), n_candidates, 2)) * cell_size
+            )
+
+            # Compare against the points already in the surrounding cells
+            neighbors = grid[
+                cell_rows[:, None] + 2 + _NEIGHBOR_OFFSETS[:, 0],
+                cell_cols[:, None] + 2 + _NEIGHBOR_OFFSETS[:, 1],
+            ]
+            dx = neighbors[:, None, :, 0] - candidates[:, :, 0, None]
+            dy = neighbors[:, None, :, 1] - candidates[:, :, 1, None]
+            # NaN (empty) neighbors compare False, so they never get in the way
+            valid = ~(dx * dx + dy * dy < min_distance**2).any(axis=2)
+            valid &= (candidates[..., 0] <= half_width) & (
+                candidates[..., 1] <= half_height
+            )
+
+            # Keep the first valid candidate of every cell that has one
+            filled = valid.any(axis=1)
+            first_valid = valid.argmax(axis=1)[filled]
+            grid[cell_rows[filled] + 2, cell_cols[filled] + 2] = candidates[
+                filled, first_valid
+            ]
+
+    points = grid[~np.isnan(grid[..., 0])]
+    return points[rng.permutation(len(points))]
+
+
+def spawn_distances(
+    agent_configs: list[AgentConfig],
+    spawn_config: SpawnConfig,
+    target_config: AgentConfig | None = None,
+) -> tuple[float, float]:
+    """How far apart agents' centers need to be so that their outlines keep the
+    configured gaps, whatever their orientations.
+
+    Args:
+        agent_configs: The configs of every group that is spawned
+        spawn_config: The gaps to keep between the agents' outlines
+        target_config: The config of the agent to keep clear of (e.g. the
+            sheep), or None if that is just a point
+
+    Returns:
+        The minimum distance between any two agents and the safety radius
+        around the target (see `spawn_layout`)
+    """
+    largest_radius = max(
+        bounding_radius(agent_config) for agent_config in agent_configs
+    )
+    target_radius = 0.0 if target_config is None else bounding_radius(target_config)
+    min_distance = 2 * largest_radius + spawn_config.min_separation
+    safety_radius = largest_radius + target_radius + spawn_config.sheep_safety_radius
+    return min_distance, safety_radius
+
+
+def spawn_layout(
+    counts: list[int],
+    min_distance: float,
+    boundaries: tuple[float, float] | None = None,
+    safe_pos: tuple[float, float] = (0.0, 0.0),
+    safety_radius: float = 0.0,
+    rng: np.random.Generator | None = None,
+) -> list[np.ndarray]:
+    """Picks non-overlapping spawn positions for several groups of agents.
+
+    Args:
+        counts: The number of agents in each group
+        min_distance: The minimum distance between any two agents
+        boundaries: Half-width and half-height of the spawn area
+            (defaults to the display boundaries)
+        safe_pos: A position no agent may spawn near (e.g. the sheep's)
+        safety_radius: How close to `safe_pos` agents may spawn
+        rng: Random number generator to use
+
+    Returns:
+        One (count, 2) array of positions per group
+
+    Raises:
+        ValueError: If the agents don't fit with the requested spacing
+    """
+    points = poisson_disk_sample(min_distance, boundaries, rng)
+    distances = np.hypot(points[:, 0] - safe_pos[0], points[:, 1] - safe_pos[1])
+    points = points[distances >= safety_radius]
+
+    n_agents = sum(counts)
+    if len(points) < n_agents:
+        raise ValueError(
+            f"Can't fit {n_agents} agents {min_distance} apart "
+            f"(only found room for {len(points)})."
+        )
+
+    # Points are in random order, so any slice of them is a random layout
+    split_at = np.cumsum(counts)[:-1]
+    return np.split(points[:n_agents], split_at)
@@ -0,0 +1,206 @@
+"""Live telemetry and remote control for running sessions.
+
+A `TelemetryServer` runs an asyncio loop on a background thread and serves
+newline-delimited JSON over a local TCP socket. The render loop hands over a
+snapshot per frame by swapping a single reference (no locks, no waiting), and
+the server sends the latest one to every subscriber at a fixed, lower rate.
+Each subscriber has a one-slot queue, so a slow client only ever misses
+snapshots and can never hold up the render loop.
+
+Subscribers can also send commands, one per line, either as plain text
+(`toggle_condition`) or as JSON (`{"command": "abort"}`).
+"""
+
+import asyncio
+import json
+import threading
+import time
+from collections import deque
+from dataclasses import asdict, dataclass
+
+COMMANDS = ("toggle_condition", "abort")
+
+
+@dataclass
+class Snapshot:
+    """The state of a session on one frame."""
+
+    frame: int
+    time: float
+    frame_rate: float
+    dropped_frames: int
+    face_target: bool
+    n_agents: int
+    score: int | None = None
+
+
+class FrameStats:
+    """Frame rate and dropped frames, measured from the time of every flip."""
+
+    def __init__(self, frame_period: float, n_intervals: int = 60) -> None:
+        """
+        Args:
+            frame_period: The expected time between flips, in seconds
+            n_intervals: Over how many recent frames the frame rate is averaged
+        """
+        self.frame_period: float = frame_period
+        self.intervals: deque[float] = deque(maxlen=n_intervals)
+        self.n_frames: int = 0
+        self.dropped_frames: int = 0
+        self.first_flip: float | None = None
+        self.last_flip: float | None = None
+
+    def tick(self, now: float | None = None) -> None:
+        """Records a flip (call right after `win.flip()`)."""
+        if now is None:
+            now = time.perf_counter()
+        if self.last_flip is not None:
+            interval = now - self.last_flip
+            self.intervals.append(interval)
+            # Like PsychoPy, count a frame as dropped if it took 50% too long
+            if interval > 1.5 * self.frame_period:
+                self.dropped_frames += 1
+        else:
+            self.first_flip = now
+        self.last_flip = now
+        self.n_frames += 1
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds since the first flip."""
+        if self.first_flip is None:
+            return 0.0
+        return self.last_flip - self.first_flip
+
+    @property
+    def frame_rate(self) -> float:
+        """The average frame rate over the most recent frames."""
+        if not self.intervals:
+            return 0.0
+        return len(self.intervals) / sum(self.intervals)
+
+
+class TelemetryServer:
+    """Serves session snapshots to local subscribers and collects their commands."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 8765, rate_hz: float = 10):
+        self.host: str = host
+        self.port: int = port
+        self.rate_hz: float = rate_hz
+
+        # Written by the render loop, read by the server (a plain reference swap)
+        self._latest: Snapshot | None = None
+        # Appended by the server, drained by the render loop (deque is thread-safe)
+        self._commands: deque[str] = deque()
+
+        self._clients: set[asyncio.Queue] = set()
+        self._stopping: bool = False
+        self._ready = threading.Event()
+        self._error: BaseException | None = None
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    ##########################
+    #### Render loop side ####
+    ##########################
+
+    def start(self, timeout: float = 5.0) -> None:
+        """Starts serving on a background thread.
+
+        Raises:
+            RuntimeError: If the server couldn't be started (e.g. port in use)
+        """
+        self._thread.start()
+        if not self._ready.wait(timeout) or self._error is not None:
+            raise RuntimeError(
+                f"Telemetry server failed to start on {self.host}:{self.port}."
+            ) from self._error
+
+    def publish(self, snapshot: Snapshot) -> None:
+        """Hands over the latest snapshot; never blocks."""
+        self._latest = snapshot
+
+    def poll_commands(self) -> list[str]:
+        """Returns (and forgets) the commands received since the last call."""
+        commands = []
+        while self._commands:
+            commands.append(self._commands.popleft())
+        return commands
+
+    def stop(self) -> None:
+        self._stopping = True
+        self._thread.join(timeout=2.0)
+
+    #####################
+    #### Server side ####
+    #####################
+
+    def _run(self) -> None:
+        try:
+            asyncio.run(self._serve())
+        except BaseException as error:
+            self._error = error
+            self._ready.set()
+
+    async def _serve(self) -> None:
+        server = await asyncio.start_server(self._handle_client, self.host, self.port)
+        self.port = server.sockets[0].getsockname()[1]  # in case port 0 was asked for
+        self._ready.set()
+
+        async with server:
+            await self._broadcast()
+
+        # Disconnect everyone that is still connected
+        tasks = asyncio.all_tasks() - {asyncio.current_task()}
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _broadcast(self) -> None:
+        """Sends the latest snapshot to every subscriber, `rate_hz` times per second."""
+        last_sent = None
+        while not self._stopping:
+            await asyncio.sleep(1 / self.rate_hz)
+            snapshot = self._latest
+            if snapshot is None or snapshot is last_sent:
+                continue
+            last_sent = snapshot
+
+            line = (json.dumps(asdict(snapshot)) + "\n").encode()
+            for queue in self._clients:
+                if queue.full():
+                    queue.get_nowait()  # the client hasn't kept up; drop the stale one
+                queue.put_nowait(line)
+
+    async def _handle_client(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=1)
+        self._clients.add(queue)
+        sender = asyncio.create_task(self._send(queue, writer))
+        try:
+            while line := await reader.readline():
+                self._receive(line)
+        except ConnectionError:
+            pass
+        finally:
+            self._clients.discard(queue)
+            sender.cancel()
+            writer.close()
+
+    async def _send(self, queue: asyncio.Queue, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                writer.write(await queue.get())
+                await writer.drain()
+        except ConnectionError:
+            pass
+
+    def _receive(self, line: bytes) -> None:
+        text = line.decode(errors="replace").strip()
+        try:
+            message = json.loads(text)
+            command = message.get("command") if isinstance(message, dict) else None
+        except json.JSONDecodeError:
+            command = text
+        if command in COMMANDS:
+            self._commands.append(command)
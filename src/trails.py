@@ -0,0 +1,144 @@
+"""Fading motion trails behind moving agents.
+
+Past positions live in a preallocated (agents x length) ring buffer that is
+overwritten in place every frame, and all trail segments are drawn as the
+elements of a single `ElementArrayStim`. Memory use and the cost per frame
+therefore only depend on the number of agents and the trail length, never on
+how long the session has been running.
+"""
+
+import numpy as np
+from .rasterizer import to_rgb255
+from psychopy import visual
+
+
+class TrailBuffer:
+    """The last `length` positions of every agent, in a ring buffer."""
+
+    def __init__(self, n_agents: int, length: int) -> None:
+        if length < 2:
+            raise ValueError("A trail needs at least 2 positions.")
+        self.positions: np.ndarray = np.zeros((n_agents, length, 2))
+        self.length: int = length
+        self.head: int = 0  # the slot the next positions are written to
+        self.n_filled: int = 0
+        self._slots: np.ndarray = np.arange(length)
+
+    def push(self, positions: np.ndarray) -> None:
+        """Adds the agents' current positions, overwriting the oldest ones."""
+        self.positions[:, self.head] = positions
+        self.head = (self.head + 1) % self.length
+        self.n_filled = min(self.n_filled + 1, self.length)
+
+    def clear(self) -> None:
+        """Forgets all past positions (e.g. after agents have been respawned)."""
+        self.head = 0
+        self.n_filled = 0
+
+    def ages(self) -> np.ndarray:
+        """How many frames ago each slot was written (0 = the newest positions).
+
+        Slots that haven't been written yet count as `length` frames old.
+        """
+        ages = (self.head - 1 - self._slots) % self.length
+        ages[ages >= self.n_filled] = self.length
+        return ages
+
+
+def segment_geometry(
+    starts: np.ndarray, ends: np.ndarray
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Centers, lengths and orientations of line segments, for drawing them as
+    rotated rectangles.
+
+    Args:
+        starts: (..., 2) array of start points
+        ends: (..., 2) array of end points
+
+    Returns:
+        Centers (..., 2), lengths (...) and orientations (...) in PsychoPy
+        degrees (clockwise, 0 = the rectangle's long side is horizontal)
+    """
+    deltas = ends - starts
+    centers = (starts + ends) / 2
+    lengths = np.hypot(deltas[..., 0], deltas[..., 1])
+    oris = -np.degrees(np.arctan2(deltas[..., 1], deltas[..., 0]))
+    return centers, lengths, oris
+
+
+class MotionTrails:
+    """Draws a fading trail behind each agent with one draw call per frame."""
+
+    def __init__(
+        self,
+        window: visual.Window,
+        colors: list[str | tuple[float, float, float]],
+        length: int = 30,
+        width: float = 0.1,
+        opacity: float = 0.6,
+    ) -> None:
+        """
+        Args:
+            window: The window to draw in
+            colors: One color per agent
+            length: How many past frames the trails cover
+            width: How thick the trails are (in window units)
+            opacity: How opaque the trails are right behind the agents; older
+                segments fade out linearly
+        """
+        n_agents = len(colors)
+        self.buffer: TrailBuffer = TrailBuffer(n_agents, length)
+        self.width: float = width
+
+        # Segment i of an agent joins ring slots i and i + 1, and is as old as
+        # its older end, slot i. The segment that starts at the newest slot
+        # (age 0) would join it to the oldest one, so it is never shown.
+        self._next_slots: np.ndarray = (np.arange(length) + 1) % length
+        self._fade: np.ndarray = np.zeros(length + 1)
+        self._fade[1:length] = opacity * (length - np.arange(1, length)) / (length - 1)
+
+        # Output arrays, reused every frame
+        n_elements = n_agents * length
+        self._sizes: np.ndarray = np.full((n_elements, 2), width)
+        self._opacities: np.ndarray = np.zeros(n_elements)
+
+        self.stimulus: visual.ElementArrayStim = visual.ElementArrayStim(
+            window,
+            nElements=n_elements,
+            xys=np.zeros((n_elements, 2)),
+            sizes=self._sizes,
+            oris=np.zeros(n_elements),
+            opacities=self._opacities,
+            colors=np.repeat([to_rgb255(color) for color in colors], length, axis=0),
+            colorSpace="rgb255",
+            elementTex=None,  # solid rectangles
+            elementMask=None,
+        )
+
+    def update(self, positions: np.ndarray) -> None:
+        """Adds the agents' current positions to their trails."""
+        buffer = self.buffer
+        buffer.push(positions)
+
+        starts = buffer.positions
+        ends = buffer.positions[:, self._next_slots]
+        centers, lengths, oris = segment_geometry(starts, ends)
+
+        # Unwritten slots are `length` frames old, so they are invisible too
+        opacities = self._fade[buffer.ages()]
+        self._opacities.reshape(-1, buffer.length)[:] = opacities
+
+        self._sizes[:, 0] = lengths.ravel()
+        self.stimulus.xys = centers.reshape(-1, 2)
+        self.stimulus.oris = oris.ravel()
+        self.stimulus.sizes = self._sizes
+        self.stimulus.opacities = self._opacities
+
+    def clear(self) -> None:
+        """Hides the trails until the agents have moved again."""
+        self.buffer.clear()
+        self._opacities[:] = 0
+        self.stimulus.opacities = self._opacities
+
+    def draw(self) -> None:
+        self.stimulus.draw()
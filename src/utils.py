@@ -1,4 +1,11 @@
-from .config import get_config, Config, DemoConfig
+import argparse
+import numpy as np
+from .agents import Wolf
+from .cache import TrialCache, trial_key
+from .config import get_config, AgentConfig, Config, DemoConfig
+from .inputs import InputSource, MouseInput, TraceInput, save_trace
+from .spawn import spawn_distances, spawn_layout
+from .telemetry import TelemetryServer
 from psychopy import visual
 
 
@@ -12,10 +19,197 @@ def create_window(config: Config) -> visual.Window:
         allowGUI=config.display.allow_gui,
         screen=config.display.screen,
         fullscr=config.display.full_screen,
+        # The refresh rate is measured below instead (see measure_frame_period)
+        checkTiming=False,
     )
 
     # Need to set mouse visibility after creating the window
     # __init__ doesn't take it as an argument
     win.mouseVisible = config.display.mouse_visible
 
+    # The loops time themselves by the measured frame period, not the nominal one
+    win.monitorFramePeriod = measure_frame_period(win, config)
+
     return win
+
+
+def measure_frame_period(win: visual.Window, config: Config) -> float:
+    """Measures how long the screen actually takes to refresh, in seconds."""
+    frame_rate = win.getActualFrameRate(
+        nIdentical=10,
+        nMaxFrames=120,
+        nWarmUpFrames=config.display.timing_warm_up_frames,
+        threshold=1,
+    )
+    if frame_rate is None:
+        # Frame times never settled (e.g. the machine is busy); assume the nominal rate
+        frame_rate = config.display.nominal_refresh_rate
+    return 1 / frame_rate
+
+
+def warm_up(win: visual.Window, stimuli: list, config: Config) -> None:
+    """Draws every stimulus offscreen for a few frames before anything is timed.
+
+    PsychoPy compiles shaders and uploads buffers the first time a stimulus is
+    drawn, which makes the first frames stutter. Each stimulus is drawn and
+    then cleared before the flip, so nothing shows up on the screen.
+
+    Args:
+        win: The window the stimuli belong to
+        stimuli: Anything with a `draw()` method (agents, text, trails, ...)
+        config: The configuration (for the number of warm-up frames)
+    """
+    for _ in range(config.display.warm_up_frames):
+        for stimulus in stimuli:
+            stimulus.draw()
+        win.clearBuffer()
+        win.flip()
+
+
+def sync_agents(agents: list[Wolf], positions: np.ndarray, oris: np.ndarray) -> None:
+    """Shows the wolves at positions and orientations that were computed
+    elsewhere (by an `AgentGroup` or a simulation process)."""
+    for agent, pos, ori in zip(agents, positions, oris):
+        agent.update(pos, ori)
+
+
+class FrameClock:
+    """A drop-in replacement for `core.Clock` that counts frames instead of
+    measuring real time, so that replayed sessions are reproducible."""
+
+    def __init__(self, frame_rate: float) -> None:
+        self.frame_rate: float = frame_rate
+        self.frames: int = 0
+
+    def reset(self) -> None:
+        self.frames = 0
+
+    def tick(self) -> None:
+        """Advances the clock by one frame (call once per flip)."""
+        self.frames += 1
+
+    def getTime(self) -> float:
+        return self.frames / self.frame_rate
+
+
+def parse_replay_args(config: Config) -> None:
+    """Applies the command line options for unattended runs to the config."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--trace", help="replay this mouse trace (.npz, .npy or .csv)")
+    parser.add_argument("--record", help="save the session's mouse trace here")
+    parser.add_argument("--seed", type=int, help="seed for reproducible runs")
+    args = parser.parse_args()
+
+    if args.trace is not None:
+        config.replay.trace_path = args.trace
+    if args.record is not None:
+        config.replay.record_path = args.record
+    if args.seed is not None:
+        config.replay.seed = args.seed
+
+
+def create_rng(config: Config) -> np.random.Generator:
+    """Seeds NumPy's global generator (used by the agents) and returns a new
+    generator (for agent groups) from the configured seed."""
+    if config.replay.seed is not None:
+        np.random.seed(config.replay.seed)
+    return np.random.default_rng(config.replay.seed)
+
+
+def use_simulation_process(config: Config) -> bool:
+    """Whether to simulate agents in a separate process (see `Config.simulation_process`).
+
+    Replayed sessions always simulate in-process: the render loop shows whichever
+    frame the worker last published, which depends on timing, so replays
+    wouldn't be reproducible.
+    """
+    return config.simulation_process and config.replay.trace_path is None
+
+
+def create_input_source(win: visual.Window, config: Config) -> InputSource:
+    """Creates the sheep's input source: a replayed trace or the (recorded) mouse."""
+    if config.replay.trace_path is not None:
+        return TraceInput.from_file(config.replay.trace_path)
+    return MouseInput(win, record=config.replay.record_path is not None)
+
+
+def save_recording(
+    input_source: InputSource, win: visual.Window, config: Config
+) -> None:
+    """Saves the recorded mouse trace, along with the display's measured frame
+    period, if the session was being recorded."""
+    if config.replay.record_path is not None and isinstance(input_source, MouseInput):
+        save_trace(
+            config.replay.record_path, input_source.history, win.monitorFramePeriod
+        )
+
+
+def create_replay_clock(
+    input_source: InputSource, win: visual.Window, config: Config
+) -> FrameClock:
+    """A frame clock that runs at the rate the replayed trace was recorded at.
+
+    The configured `ReplayConfig.frame_rate` takes precedence; traces that don't
+    store their frame period are replayed at this display's measured rate.
+    """
+    if config.replay.frame_rate is not None:
+        return FrameClock(config.replay.frame_rate)
+    frame_period = win.monitorFramePeriod
+    if isinstance(input_source, TraceInput) and input_source.frame_period is not None:
+        frame_period = input_source.frame_period
+    return FrameClock(1 / frame_period)
+
+
+def create_spawn_layout(
+    config: Config,
+    agent_configs: list[AgentConfig],
+    counts: list[int],
+    safe_pos: tuple[float, float],
+) -> list[np.ndarray]:
+    """Spawn positions for every group (see `spawn_layout`). Seeded layouts are
+    only generated once and then loaded from the trial cache."""
+
+    min_distance, safety_radius = spawn_distances(
+        agent_configs, config.spawn, target_config=config.sheep
+    )
+
+    def create() -> dict[str, np.ndarray]:
+        layout = spawn_layout(
+            counts,
+            min_distance,
+            safe_pos=safe_pos,
+            safety_radius=safety_radius,
+            rng=np.random.default_rng(config.replay.seed),
+        )
+        return {f"group_{i}": positions for i, positions in enumerate(layout)}
+
+    if config.replay.seed is None or not config.cache.enabled:
+        arrays = create()
+    else:
+        key = trial_key(
+            agent_configs,
+            config.display,
+            config.replay.seed,
+            kind="spawn",
+            counts=counts,
+            spawn=config.spawn,
+            safe_pos=tuple(safe_pos),
+            # These also depend on the sheep's shape, which isn't hashed above
+            min_distance=min_distance,
+            safety_radius=safety_radius,
+        )
+        cache = TrialCache(config.cache.directory, config.cache.max_bytes)
+        arrays = cache.get_or_create(key, create)
+
+    return [np.array(arrays[f"group_{i}"]) for i in range(len(counts))]
+
+
+def start_telemetry(config: Config) -> TelemetryServer | None:
+    """Starts the telemetry server, if it is enabled in the config."""
+    if not config.telemetry.enabled:
+        return None
+    server = TelemetryServer(
+        config.telemetry.host, config.telemetry.port, config.telemetry.rate_hz
+    )
+    server.start()
+    return server
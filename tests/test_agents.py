@@ -2,6 +2,7 @@ import pytest
 import numpy as np
 from src.agents import Agent, Wolf, Sheep
 from src.config import config
+from src.inputs import TraceInput
 from unittest.mock import Mock, patch
 
 ############################
@@ -61,57 +62,40 @@ def test_agent_get_bounded_pos() -> None:
 ###########################
 
 
-def test_wolf_calculate_facing_angle() -> None:
-    """Test the calculate_facing_angle method logic."""
+def test_wolf_update_shows_new_pose() -> None:
+    """Wolves only show the position and orientation their group computed."""
     # Create a minimal Wolf instance, bypassing __init__ entirely
     wolf = object.__new__(Wolf)
-
-    # Next, we manually set attributes needed by this particular method
-    # This one needs `self.pos`, which itself is a property that reads `self.stimulus.pos`
-    # so we need self.stimulus.pos, which means we need a mock stimulus
-    # Mock is a class from pytest that allows us to create "dummy" objects
+    # Mock is a class from unittest that allows us to create "dummy" objects
     # that simulate the behavior of real objects. In this case, I don't want to
     # have to create a whole actual visual stimulus, since that will make the
     # tests run slowly. Mock objects will allow us to simulate a stimulus.
-
     wolf.stimulus = Mock()
-    wolf.stimulus.pos = (0.0, 0.0)  # Set initial position for the test
-
-    # Test cases (using np.isclose for float comparison to avoid floating point precision issues)
-    # Target directly above (0, 1) -> PsychoPy angle 0 deg, real angle 90 deg
-    angle_deg = wolf.calculate_facing_angle(target_pos=(0, 1), units="deg")
-    assert np.isclose(angle_deg, 0.0), "Angle to target directly above failed"
-
-    # Target directly right (1, 0) -> PsychoPy angle 90 deg, real angle 0 deg
-    angle_deg = wolf.calculate_facing_angle(target_pos=(1, 0), units="deg")
-    assert np.isclose(angle_deg, 90.0), "Angle to target directly to the right failed"
-
-    # Target bottom left (-1, -1) -> PsychoPy angle 225 deg, real angle... also 225 deg
-    angle_deg = wolf.calculate_facing_angle(target_pos=(-1, -1), units="deg")
-    assert np.isclose(angle_deg, 225.0), "Angle to target bottom-left failed"
-
-    # Target bottom right (1, -1) -> PsychoPy angle 135 deg, real angle 315 deg
-    angle_deg = wolf.calculate_facing_angle(target_pos=(1, -1), units="deg")
-    assert np.isclose(angle_deg, 135.0), "Angle to target bottom-right failed"
-
-    # Test radians
-    # Target directly above (0, 1) -> PsychoPy angle 0 rad, real angle pi/2 rad
-    angle_rad = wolf.calculate_facing_angle(target_pos=(0, 1), units="rad")
-    assert np.isclose(angle_rad, 0.0), "Radians angle to target directly above failed"
-    # Target directly right (1, 0) -> PsychoPy angle pi/2 rad, real angle 0 rad
-    angle_rad = wolf.calculate_facing_angle(target_pos=(1, 0), units="rad")
-    assert np.isclose(
-        angle_rad, np.pi / 2
-    ), "Radians angle to target directly to the right failed"
-    # Target bottom left (-1, -1) -> PsychoPy angle 5pi/4 rad, real angle 5pi/4 rad
-    angle_rad = wolf.calculate_facing_angle(target_pos=(-1, -1), units="rad")
-    assert np.isclose(
-        angle_rad, 5 * np.pi / 4
-    ), "Radians angle to target bottom-left failed"
-
-    # Target bottom right (1, -1) -> PsychoPy angle 3pi/4 rad, real angle 7pi/4 rad
-    angle_rad = wolf.calculate_facing_angle(target_pos=(1, -1), units="rad")
-    print(angle_rad)
-    assert np.isclose(
-        angle_rad, 3 * np.pi / 4
-    ), "Radians angle to target bottom-right failed"
+    wolf.stimulus.pos = (0.0, 0.0)
+    wolf.stimulus.ori = 0.0
+
+    wolf.update(pos=(1.0, -2.0), ori=135.0)
+    assert wolf.pos == (1.0, -2.0), "Wolf didn't move"
+    assert wolf.ori == 135.0, "Wolf didn't turn"
+
+
+############################
+#### Sheep Method Tests ####
+############################
+
+
+def test_sheep_follows_trace() -> None:
+    """The sheep moves by the input's movement since the last frame."""
+    # As above, bypass __init__ and only set what `update` needs
+    sheep = object.__new__(Sheep)
+    sheep.stimulus = Mock()
+    sheep.stimulus.pos = (0.0, 0.0)
+    sheep.config = config.sheep
+    sheep.input_source = TraceInput(np.array([(1.0, 1.0), (1.5, 0.5), (1.5, 0.5)]))
+    sheep.last_mouse_x, sheep.last_mouse_y = sheep.input_source.get_pos()
+
+    sheep.update()
+    assert np.allclose(sheep.pos, (0.5, -0.5)), "Sheep didn't follow the trace"
+
+    sheep.update()
+    assert np.allclose(sheep.pos, (0.5, -0.5)), "Sheep moved without any input"
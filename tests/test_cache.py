@@ -0,0 +1,78 @@
+import dataclasses
+import os
+import numpy as np
+from src.cache import TrialCache, cached_trial, trial_key
+from src.config import AgentConfig, DemoConfig, SpawnConfig
+
+
+def test_trial_key_is_stable_and_specific() -> None:
+    display = DemoConfig().display
+    key = trial_key(AgentConfig(), display, seed=1, n_frames=10)
+
+    assert key == trial_key(AgentConfig(), display, seed=1, n_frames=10)
+    assert key != trial_key(AgentConfig(), display, seed=2, n_frames=10)
+    assert key != trial_key(AgentConfig(speed=0.1), display, seed=1, n_frames=10)
+    assert key != trial_key(AgentConfig(), display, seed=1, n_frames=11)
+
+    # Settings that don't change the trial don't change the key either (the
+    # display config is shared between configs, so change a copy of it)
+    other_screen = dataclasses.replace(display, screen=display.screen + 1)
+    assert other_screen is not display
+    assert key == trial_key(AgentConfig(), other_screen, seed=1, n_frames=10)
+
+    # ...unlike settings that do
+    other_distance = dataclasses.replace(
+        display, viewing_distance_cm=display.viewing_distance_cm + 10
+    )
+    assert key != trial_key(AgentConfig(), other_distance, seed=1, n_frames=10)
+
+
+def test_get_or_create_only_creates_once(tmp_path) -> None:
+    cache = TrialCache(str(tmp_path))
+    calls = []
+
+    def create() -> dict[str, np.ndarray]:
+        calls.append(1)
+        return {"positions": np.arange(6.0).reshape(3, 2)}
+
+    first = cache.get_or_create("key", create)
+    second = cache.get_or_create("key", create)
+    assert len(calls) == 1, "Cached entry was generated again"
+    assert isinstance(second["positions"], np.memmap), "Entries should be memory-mapped"
+    assert np.array_equal(first["positions"], second["positions"])
+
+
+def test_put_keeps_existing_entry(tmp_path) -> None:
+    """If another process already published an entry, it is left alone."""
+    cache = TrialCache(str(tmp_path))
+    cache.put("key", {"a": np.zeros(3)})
+    arrays = cache.put("key", {"a": np.zeros(3)})
+    assert np.array_equal(arrays["a"], np.zeros(3))
+    assert not any(name.startswith(".tmp-") for name in os.listdir(tmp_path))
+
+
+def test_evicts_least_recently_used(tmp_path) -> None:
+    array = {"a": np.zeros(1000)}  # ~8 KB per entry
+    cache = TrialCache(str(tmp_path), max_bytes=20_000)
+    cache.put("old", array)
+    cache.put("used", array)
+    os.utime(tmp_path / "old", (0, 0))
+    os.utime(tmp_path / "used", (1, 1))
+
+    cache.put("new", array)
+    assert cache.get("old") is None, "Least recently used entry should be evicted"
+    assert cache.get("used") is not None
+    assert cache.get("new") is not None
+    assert cache.size() <= 20_000
+
+
+def test_cached_trial_matches_generated(tmp_path) -> None:
+    config = DemoConfig()
+    cache = TrialCache(str(tmp_path))
+    args = (config.wolf, config.display, 7, 3, 20, SpawnConfig())
+
+    first = cached_trial(cache, *args)
+    second = cached_trial(cache, *args)
+    assert first["positions"].shape == (20, 3, 2)
+    assert first["oris"].shape == (20, 3)
+    assert np.array_equal(first["positions"], second["positions"])
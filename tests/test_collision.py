@@ -0,0 +1,92 @@
+import numpy as np
+import pytest
+from src.collision import CollisionShape, convex_pieces, overlaps
+from src.config import AgentConfig, CircleConfig, DartConfig
+
+DART = CollisionShape.from_agent_config(
+    AgentConfig(shape_type="dart", config=DartConfig(size=1.5))
+)
+
+
+def _circle(radius: float) -> CollisionShape:
+    return CollisionShape.from_agent_config(
+        AgentConfig(shape_type="circle", config=CircleConfig(size=2 * radius))
+    )
+
+
+def _area(polygon: np.ndarray) -> float:
+    x, y = polygon[:, 0], polygon[:, 1]
+    return (x * np.roll(y, -1) - np.roll(x, -1) * y).sum() / 2
+
+
+def test_convex_pieces() -> None:
+    """Convex polygons stay whole; the dart is split into two triangles."""
+    square = np.array([(0, 0), (0, 1), (1, 1), (1, 0)])
+    assert convex_pieces(square).shape == (1, 4, 2), "Convex polygon was split"
+
+    dart = np.array(DartConfig().vertices[:-1])
+    pieces = convex_pieces(dart)
+    assert pieces.shape == (2, 3, 2), "Dart wasn't split into two triangles"
+    assert all(_area(piece) > 0 for piece in pieces), "Pieces aren't counterclockwise"
+    assert np.isclose(sum(_area(piece) for piece in pieces), abs(_area(dart)))
+
+
+def test_circle_circle() -> None:
+    shape = _circle(0.5)
+    positions = np.array([(0.9, 0.0), (1.1, 0.0)])
+    hits = overlaps(shape, positions, 0, shape, (0.0, 0.0), 0)
+    assert np.array_equal(hits, [True, False]), "Wrong circle-circle overlaps"
+
+
+def test_circle_in_dart_notch() -> None:
+    """A circle in the dart's notch doesn't touch it, unlike with bounding circles."""
+    small = _circle(0.1)
+    positions = np.array([(0.0, -0.6), (0.0, 0.0), (0.0, 0.85), (0.0, 0.9)])
+    hits = overlaps(small, positions, 0, DART, (0.0, 0.0), 0)
+    assert np.array_equal(hits, [False, True, True, False]), "Wrong dart outline"
+    # Same result with the arguments swapped
+    hits = overlaps(DART, (0.0, 0.0), 0, small, positions, 0)
+    assert np.array_equal(hits, [False, True, True, False]), "Not symmetric"
+
+
+def test_dart_orientation() -> None:
+    """Rotating a dart by 180 degrees points its tip down."""
+    circle = _circle(0.2)
+    hits = overlaps(DART, np.zeros((2, 2)), [0, 180], circle, (0.0, -0.9), 0)
+    assert np.array_equal(hits, [False, True]), "Orientation was ignored"
+
+
+def test_dart_dart() -> None:
+    positions = np.array([(1.4, 0.0), (1.6, 0.0), (0.0, 0.9), (0.0, 1.2)])
+    hits = overlaps(DART, positions, 0, DART, (0.0, 0.0), 0)
+    # At 1.2 above, the upper dart's notch fits around the lower one's tip
+    assert np.array_equal(hits, [True, False, True, False]), "Wrong dart overlaps"
+
+
+@pytest.mark.parametrize("shape_a", [_circle(0.2), DART], ids=["circle", "dart"])
+@pytest.mark.parametrize("shape_b", [_circle(0.4), DART], ids=["circle", "dart"])
+def test_swept_no_tunneling(shape_a, shape_b) -> None:
+    """Agents that jump through each other between frames are caught by swept tests."""
+    previous = np.array([(-5.0, 0.0), (-5.0, 3.0)])
+    current = np.array([(5.0, 0.0), (5.0, 3.0)])
+
+    static_hits = overlaps(shape_a, current, 0, shape_b, (0.0, 0.0), 0)
+    assert not static_hits.any(), "Agents shouldn't overlap on either frame"
+
+    hits = overlaps(
+        shape_a, current, 0, shape_b, (0.0, 0.0), 0, previous_positions_a=previous
+    )
+    assert np.array_equal(hits, [True, False]), "Agent tunneled through"
+
+    # Only relative motion matters: both moving together never meet
+    hits = overlaps(
+        shape_a,
+        current,
+        0,
+        shape_b,
+        (10.0, -3.0),
+        0,
+        previous_positions_a=previous,
+        previous_positions_b=(0.0, -3.0),
+    )
+    assert not hits.any(), "Agents moving in parallel were reported as colliding"
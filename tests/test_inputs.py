@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+from src.inputs import TraceInput, circular_trace, load_trace, save_trace
+
+
+def test_trace_input_replays_then_holds() -> None:
+    """A trace replays one position per frame, then stays at its last position."""
+    trace = TraceInput(np.array([(0.0, 0.0), (1.0, 2.0)]))
+    assert trace.get_pos() == (0.0, 0.0)
+    assert not trace.finished
+    assert trace.get_pos() == (1.0, 2.0)
+    assert trace.finished, "Trace should be finished after its last position"
+    assert trace.get_pos() == (1.0, 2.0), "Finished trace should hold its position"
+
+
+def test_trace_input_needs_positions() -> None:
+    with pytest.raises(ValueError):
+        TraceInput(np.empty((0, 2)))
+
+
+@pytest.mark.parametrize(
+    "filename, kept_period",
+    [("trace.npz", True), ("trace.csv", True), ("trace.npy", False)],
+)
+def test_save_and_load_trace(tmp_path, filename: str, kept_period: bool) -> None:
+    positions = circular_trace(n_frames=10, radius=2.0, frames_per_cycle=4)
+    path = str(tmp_path / filename)
+    save_trace(path, positions, frame_period=1 / 120)
+    loaded, frame_period = load_trace(path)
+    assert np.allclose(loaded, positions), "Trace changed on the way"
+    assert frame_period == (1 / 120 if kept_period else None)
+
+
+def test_trace_without_frame_period(tmp_path) -> None:
+    path = str(tmp_path / "trace.npz")
+    save_trace(path, [(0.0, 0.0)])
+    assert TraceInput.from_file(path).frame_period is None
+
+
+def test_circular_trace() -> None:
+    positions = circular_trace(n_frames=5, radius=2.0, frames_per_cycle=4)
+    assert positions.shape == (5, 2)
+    assert np.allclose(np.hypot(*positions.T), 2.0), "Trace should stay on the circle"
+    assert np.allclose(positions[0], positions[4]), "Trace should loop every cycle"
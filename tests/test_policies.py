@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+from src.config import AgentConfig
+from src.policies import POLICIES, get_policy, register_policy
+from src.simulation import AgentGroup
+
+
+def make_group(policy: str, **kwargs) -> AgentGroup:
+    # Agents on the corners of a square around the origin, standing still
+    positions = np.array([(1.0, 1.0), (-1.0, 1.0), (-1.0, -1.0), (1.0, -1.0)])
+    return AgentGroup(
+        AgentConfig(speed=0, policy=policy, **kwargs),
+        len(positions),
+        positions=positions,
+        rng=np.random.default_rng(0),
+        boundaries=(5.0, 5.0),
+    )
+
+
+def test_pursuit_heads_for_target() -> None:
+    group = make_group("pursuit")
+    group.step(target_pos=(0, 0))
+    headings = np.column_stack([np.cos(group.directions), np.sin(group.directions)])
+    assert np.allclose(
+        headings, -group.positions / np.sqrt(2)
+    ), "Pursuers should head straight for the target"
+
+
+def test_flee_heads_away_from_target() -> None:
+    group = make_group("flee")
+    group.step(target_pos=(0, 0))
+    headings = np.column_stack([np.cos(group.directions), np.sin(group.directions)])
+    assert np.allclose(
+        headings, group.positions / np.sqrt(2)
+    ), "Fleeing agents should head straight away from the target"
+
+
+def test_subtle_pursuit_stays_within_window() -> None:
+    """Headings deviate from the target by up to (not half of) the chasing subtlety."""
+    chasing_subtlety = np.pi / 3
+    group = make_group("subtle_pursuit", chasing_subtlety=chasing_subtlety)
+    to_target = np.arctan2(-group.positions[:, 1], -group.positions[:, 0])
+
+    deviations = []
+    for _ in range(25):
+        group.frames_until_direction_update[:] = 1  # all due this frame
+        group.step(target_pos=(0, 0))
+        deviations.append(np.angle(np.exp(1j * (group.directions - to_target))))
+    deviations = np.abs(np.concatenate(deviations))
+
+    assert np.all(deviations <= chasing_subtlety), "Direction outside of the window"
+    assert np.any(
+        deviations > chasing_subtlety / 2
+    ), "Directions only cover half of the window"
+
+
+def test_unknown_policy() -> None:
+    with pytest.raises(ValueError):
+        get_policy("teleport")
+
+
+def test_register_policy() -> None:
+    """Registered policies can be selected by name from the config."""
+
+    @register_policy("north")
+    def north(group, target_pos, due) -> None:
+        group.directions[:] = np.pi / 2
+
+    try:
+        group = make_group("north")
+        group.step(target_pos=(0, 0))
+        assert np.allclose(group.directions, np.pi / 2)
+    finally:
+        del POLICIES["north"]
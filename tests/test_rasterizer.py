@@ -0,0 +1,87 @@
+import numpy as np
+from src.config import AgentConfig, CircleConfig, DartConfig
+from src.rasterizer import Canvas, Sprite, fill_polygon, iter_frames, render_frame
+
+WHITE = np.array([255, 255, 255], dtype=np.uint8)
+BLACK = np.array([0, 0, 0], dtype=np.uint8)
+
+
+def make_canvas() -> Canvas:
+    # 10 pixels per unit, so the canvas spans -4..4 by -3..3 units
+    return Canvas(size_px=(80, 60), pix_per_unit=10, bg_color=BLACK)
+
+
+def test_fill_polygon_square() -> None:
+    """Pixels are filled when their centers lie inside the polygon."""
+    frame = np.zeros((10, 10, 3), dtype=np.uint8)
+    square = np.array([(2.0, 2.0), (6.0, 2.0), (6.0, 6.0), (2.0, 6.0)])
+    fill_polygon(frame, square, WHITE)
+
+    filled = frame[..., 0] == 255
+    assert filled.sum() == 16, "Square should cover exactly 4x4 pixels"
+    assert filled[2:6, 2:6].all(), "Square covers the wrong pixels"
+
+
+def test_fill_polygon_concave_dart() -> None:
+    """The notch of the (concave) dart must stay unfilled."""
+    frame = np.zeros((100, 100, 3), dtype=np.uint8)
+    # Default dart vertices, scaled up and flipped into pixel coordinates
+    vertices = np.array(DartConfig().vertices[:-1]) * [100, -100] + [50, 50]
+    fill_polygon(frame, vertices, WHITE)
+
+    assert frame[30, 50, 0] == 255, "Body of the dart should be filled"
+    assert frame[85, 50, 0] == 0, "Notch of the dart should not be filled"
+    assert frame[5, 5, 0] == 0, "Outside of the dart should not be filled"
+
+
+def test_render_frame_orientation() -> None:
+    """Orientations are clockwise in degrees, like PsychoPy's."""
+    canvas = make_canvas()
+    # A thin bar pointing up from the sprite's position
+    sprite = Sprite(
+        vertices=np.array([(-0.1, 0.0), (0.1, 0.0), (0.1, 2.0), (-0.1, 2.0)]),
+        color=WHITE,
+    )
+
+    frame = render_frame(canvas, [sprite], np.zeros((1, 2)), np.array([0.0]))
+    assert frame[15, 40, 0] == 255, "Unrotated bar should point up"
+    assert frame[30, 55, 0] == 0, "Unrotated bar should not point right"
+
+    frame = render_frame(canvas, [sprite], np.zeros((1, 2)), np.array([90.0]))
+    assert frame[30, 55, 0] == 255, "Bar rotated by 90 degrees should point right"
+    assert frame[15, 40, 0] == 0, "Bar rotated by 90 degrees should not point up"
+
+
+def test_sprite_matches_circle_config() -> None:
+    """Circles are rasterized with the configured radius and color."""
+    canvas = make_canvas()
+    agent_config = AgentConfig(
+        shape_type="circle", config=CircleConfig(color="white", size=2.0)
+    )
+    sprite = Sprite.from_agent_config(agent_config)
+
+    frame = render_frame(canvas, [sprite], np.array([[1.0, 0.0]]), np.array([0.0]))
+    filled = frame[..., 0] == 255
+    # Radius 1 unit == 10 pixels, so the area is close to pi * 10^2
+    assert abs(filled.sum() - np.pi * 100) < 15, "Circle has the wrong size"
+    assert filled[30, 50], "Circle should be centered at (1, 0)"
+
+
+def test_iter_frames_matches_render_frame() -> None:
+    """Frames rendered in parallel are identical to (and in the same order as)
+    frames rendered serially."""
+    canvas = make_canvas()
+    sprites = [
+        Sprite(vertices=np.array([(-0.5, -0.5), (0, 0.5), (0.5, -0.5)]), color=WHITE)
+    ]
+    n_frames = 7
+    positions = np.column_stack([np.linspace(-3, 3, n_frames), np.zeros(n_frames)])[
+        :, None, :
+    ]
+    oris = np.linspace(0, 180, n_frames)[:, None]
+
+    for i, frame in enumerate(
+        iter_frames(canvas, sprites, positions, oris, processes=2)
+    ):
+        expected = render_frame(canvas, sprites, positions[i], oris[i])
+        assert np.array_equal(frame, expected), f"Frame {i} differs"
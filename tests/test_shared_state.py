@@ -0,0 +1,50 @@
+import numpy as np
+from src.config import AgentConfig
+from src.shared_state import SharedFrameBuffer, SimulationProcess
+
+
+def test_shared_frame_buffer_never_overwrites_acquired_frame() -> None:
+    """The writer may run one frame ahead, but never touches the reader's slot."""
+    buffer = SharedFrameBuffer(n_agents=2)
+    try:
+        assert buffer.latest() is None, "Nothing has been published yet"
+
+        # Frame 0
+        assert buffer.can_write()
+        buffer.back_slot()[:] = 0
+        buffer.publish()
+        assert not buffer.can_write(), "Reader hasn't acquired frame 0 yet"
+
+        frame, values = buffer.latest()
+        assert frame == 0 and np.all(values == 0)
+
+        # Frame 1 goes into the other slot while the reader holds frame 0
+        assert buffer.can_write()
+        buffer.back_slot()[:] = 1
+        buffer.publish()
+        assert not buffer.can_write(), "Writer would overwrite the reader's slot"
+        assert np.all(values == 0), "Acquired frame was overwritten"
+
+        frame, values = buffer.latest()
+        assert frame == 1 and np.all(values == 1)
+        del values
+    finally:
+        buffer.close()
+
+
+def test_simulation_process_publishes_frames() -> None:
+    """Positions and orientations computed in the worker reach the reader."""
+    positions = np.array([(0.0, 0.0), (1.0, 1.0), (-1.0, -1.0)])
+    simulation = SimulationProcess(
+        [(AgentConfig(speed=0), 1), (AgentConfig(speed=0, face_target=False), 2)],
+        positions=positions,
+        seed=0,
+    )
+    simulation.start(target_pos=(5.0, 0.0))
+    try:
+        new_positions, oris = simulation.latest()
+        assert np.allclose(new_positions, positions), "Stationary agents moved"
+        assert np.isclose(oris[0] % 360, 90), "Facing agent should face the target"
+        del new_positions, oris
+    finally:
+        simulation.stop()
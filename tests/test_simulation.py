@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+from src.config import AgentConfig
+from src.simulation import AgentGroup
+
+
+def make_group(count: int = 3, **kwargs) -> AgentGroup:
+    return AgentGroup(
+        AgentConfig(speed=0.5, **kwargs),
+        count,
+        positions=np.zeros((count, 2)),
+        rng=np.random.default_rng(0),
+        boundaries=(1.0, 1.0),
+    )
+
+
+def test_agent_group_moves_along_direction() -> None:
+    """Agents move `speed` units along their direction every frame."""
+    group = make_group()
+    group.directions[:] = [0, np.pi / 2, np.pi]
+    group.frames_until_direction_update[:] = 100  # no random updates
+
+    group.step(target_pos=(0, 5))
+    assert np.allclose(
+        group.positions, [(0.5, 0), (0, 0.5), (-0.5, 0)]
+    ), "Agents moved in the wrong direction"
+
+
+def test_agent_group_bounces_off_boundaries() -> None:
+    """Like Wolf, agents are kept in bounds and bounce off the edges."""
+    group = make_group(count=2)
+    group.positions[:] = [(0.8, 0), (0, -0.8)]
+    group.directions[:] = [0, 3 * np.pi / 2]
+    group.frames_until_direction_update[:] = 100
+
+    group.step(target_pos=(0, 0))
+    assert np.allclose(group.positions, [(1, 0), (0, -1)]), "Agents left the bounds"
+    assert np.allclose(
+        np.cos(group.directions[0]), -1
+    ), "Agent hitting a vertical edge should bounce back horizontally"
+    assert np.allclose(
+        np.sin(group.directions[1]), 1
+    ), "Agent hitting a horizontal edge should bounce back vertically"
+
+
+def test_agent_group_updates_direction_within_window() -> None:
+    """Directions only change when their interval is up, and within the window."""
+    group = make_group(direction_update_window=np.pi / 2)
+    group.directions[:] = 1.0
+    group.frames_until_direction_update[:] = [1, 100, 100]
+
+    group.step(target_pos=(0, 0))
+    assert abs(group.directions[0] - 1.0) <= np.pi / 4, "Direction change too large"
+    assert np.allclose(group.directions[1:], 1.0), "Direction changed too early"
+    assert group.frame_counters[0] == 0, "Frame counter wasn't reset"
+
+
+@pytest.mark.parametrize(
+    "target_pos, expected_ori",
+    [((0, 1), 0.0), ((1, 0), 90.0), ((-1, -1), 225.0), ((1, -1), 135.0)],
+)
+def test_agent_group_faces_target(target_pos, expected_ori) -> None:
+    """Orientations follow PsychoPy's convention: 0 is up, clockwise is positive."""
+    group = make_group(count=1)  # at the origin
+    group.speed = 0
+
+    group.step(target_pos=target_pos)
+    assert np.isclose(group.oris[0], expected_ori), "Agent doesn't face the target"
+
+
+def test_agent_group_oris() -> None:
+    """Orientations point at the target, +90 when not facing it."""
+    group = make_group(count=1)
+    group.speed = 0
+
+    group.step(target_pos=(1, 0))
+    assert np.isclose(group.oris[0], 90), "Agent should face right"
+
+    group.face_target = False
+    group.step(target_pos=(0, 1))
+    assert np.isclose(group.oris[0], 90), "Agent should face 90 degrees away"
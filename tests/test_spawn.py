@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+from src.collision import CollisionShape, overlaps
+from src.config import SpawnConfig, get_config
+from src.spawn import poisson_disk_sample, spawn_distances, spawn_layout
+
+
+def min_pairwise_distance(points: np.ndarray) -> float:
+    distances = np.hypot(*(points[:, None, :] - points[None, :, :]).transpose(2, 0, 1))
+    return distances[np.triu_indices(len(points), k=1)].min()
+
+
+def test_poisson_disk_sample_spacing_and_bounds() -> None:
+    """Points keep their distance and stay inside the area."""
+    points = poisson_disk_sample(
+        min_distance=0.5, boundaries=(5.0, 3.0), rng=np.random.default_rng(0)
+    )
+    assert len(points) > 100, "Sampling should pack the area reasonably densely"
+    assert min_pairwise_distance(points) >= 0.5, "Points are too close together"
+    assert np.all(np.abs(points) <= (5.0, 3.0)), "Points left the area"
+
+
+def test_spawn_layout_groups_and_safety_radius() -> None:
+    """Every group gets its count, and nothing spawns near the sheep."""
+    hunters, darts, circles = spawn_layout(
+        [1, 7, 7],
+        min_distance=1.5,
+        boundaries=(14.0, 9.0),
+        safe_pos=(2.0, 1.0),
+        safety_radius=4.0,
+        rng=np.random.default_rng(0),
+    )
+    assert (len(hunters), len(darts), len(circles)) == (1, 7, 7)
+
+    points = np.concatenate([hunters, darts, circles])
+    assert min_pairwise_distance(points) >= 1.5, "Agents spawn on top of each other"
+    assert np.all(
+        np.hypot(points[:, 0] - 2.0, points[:, 1] - 1.0) >= 4.0
+    ), "Agents spawn too close to the sheep"
+
+
+def test_spawn_layout_too_dense() -> None:
+    with pytest.raises(ValueError):
+        spawn_layout([100], min_distance=1.0, boundaries=(2.0, 2.0))
+
+
+def test_spawned_darts_never_overlap() -> None:
+    """Spawn distances come from the agents' shapes, so darts never spawn
+    overlapping, whatever their orientations."""
+    config = get_config("demo")
+    spawn_config = SpawnConfig(min_separation=0.0, sheep_safety_radius=0.0)
+    min_distance, safety_radius = spawn_distances(
+        [config.wolf], spawn_config, target_config=config.sheep
+    )
+    # The dart's corners reach further than half its size
+    assert min_distance > config.wolf.config.size, "Distance ignores the dart's shape"
+    assert safety_radius > min_distance / 2, "Safety radius ignores the sheep's shape"
+
+    (positions,) = spawn_layout(
+        [40], min_distance, boundaries=(14.0, 9.0), rng=np.random.default_rng(0)
+    )
+    dart = CollisionShape.from_agent_config(config.wolf)
+    first, second = np.triu_indices(len(positions), k=1)
+    rng = np.random.default_rng(1)
+    for _ in range(10):
+        oris = rng.uniform(0, 360, len(positions))
+        hits = overlaps(
+            dart, positions[first], oris[first], dart, positions[second], oris[second]
+        )
+        assert not hits.any(), "Darts spawned overlapping each other"
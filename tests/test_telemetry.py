@@ -0,0 +1,75 @@
+import json
+import socket
+import time
+
+import pytest
+from src.telemetry import FrameStats, Snapshot, TelemetryServer
+
+
+def test_frame_stats_counts_dropped_frames() -> None:
+    """Flips that take over 1.5 frame periods count as dropped frames."""
+    stats = FrameStats(frame_period=0.01)
+    for now in [0.0, 0.01, 0.02, 0.05, 0.06]:
+        stats.tick(now)
+
+    assert stats.n_frames == 5, "Not every flip was counted"
+    assert stats.dropped_frames == 1, "The long frame wasn't counted as dropped"
+    assert stats.frame_rate == pytest.approx(4 / 0.06), "Wrong average frame rate"
+    assert stats.elapsed == pytest.approx(0.06), "Wrong elapsed time"
+
+
+@pytest.fixture
+def server():
+    server = TelemetryServer(port=0, rate_hz=100)
+    server.start()
+    yield server
+    server.stop()
+
+
+def _read_until(client: socket.socket, condition, timeout: float = 2.0):
+    """Reads snapshots until one satisfies the condition."""
+    client.settimeout(timeout)
+    lines = client.makefile("r")
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        snapshot = json.loads(lines.readline())
+        if condition(snapshot):
+            return snapshot
+    raise AssertionError("No matching snapshot arrived")
+
+
+def test_server_broadcasts_latest_snapshot(server) -> None:
+    """Subscribers receive the snapshots the render loop publishes."""
+    with socket.create_connection((server.host, server.port)) as client:
+        for frame in range(100):
+            server.publish(Snapshot(frame, frame / 60, 60.0, 0, True, 8, score=3))
+        snapshot = _read_until(client, lambda snapshot: snapshot["frame"] == 99)
+
+    assert snapshot["score"] == 3, "Snapshot fields got lost"
+    assert snapshot["face_target"] is True, "Snapshot fields got lost"
+
+
+def test_server_receives_commands(server) -> None:
+    """Commands arrive as plain text or JSON; anything else is ignored."""
+    with socket.create_connection((server.host, server.port)) as client:
+        client.sendall(b'toggle_condition\nrm -rf /\n{"command": "abort"}\n')
+
+        commands = []
+        deadline = time.monotonic() + 2.0
+        while len(commands) < 2 and time.monotonic() < deadline:
+            commands += server.poll_commands()
+            time.sleep(0.01)
+
+    assert commands == ["toggle_condition", "abort"], "Commands weren't received"
+    assert server.poll_commands() == [], "Commands were returned twice"
+
+
+def test_publish_never_blocks_on_slow_clients(server) -> None:
+    """A client that never reads doesn't hold up publishing."""
+    with socket.create_connection((server.host, server.port)):
+        start = time.perf_counter()
+        for frame in range(10_000):
+            server.publish(Snapshot(frame, 0.0, 60.0, 0, False, 8))
+        elapsed = time.perf_counter() - start
+
+    assert elapsed < 1.0, "Publishing was held up by the client"
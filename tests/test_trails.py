@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+from src.trails import MotionTrails, TrailBuffer, segment_geometry
+from unittest.mock import Mock, patch
+
+
+def test_trail_buffer_wraps_around() -> None:
+    """The buffer keeps the last `length` positions and overwrites older ones in place."""
+    buffer = TrailBuffer(n_agents=2, length=3)
+    storage = buffer.positions
+    for frame in range(5):
+        buffer.push(np.array([(frame, 0.0), (0.0, frame)]))
+
+    assert buffer.positions is storage, "The buffer was reallocated"
+    # Frames 3 and 4 overwrote frames 0 and 1
+    assert np.array_equal(buffer.positions[0, :, 0], [3, 4, 2]), "Wrong ring contents"
+    assert np.array_equal(buffer.ages(), [1, 0, 2]), "Wrong ages"
+
+
+def test_trail_buffer_ages_of_unwritten_slots() -> None:
+    """Slots that were never written are as old as the whole trail."""
+    buffer = TrailBuffer(n_agents=1, length=4)
+    buffer.push(np.array([(0.0, 0.0)]))
+    buffer.push(np.array([(1.0, 0.0)]))
+    assert np.array_equal(buffer.ages(), [1, 0, 4, 4]), "Wrong ages"
+
+
+def test_segment_geometry() -> None:
+    """Segments become rectangles centered between their ends, rotated clockwise."""
+    starts = np.array([(0.0, 0.0), (0.0, 0.0)])
+    ends = np.array([(2.0, 0.0), (0.0, 1.0)])
+    centers, lengths, oris = segment_geometry(starts, ends)
+
+    assert np.allclose(centers, [(1.0, 0.0), (0.0, 0.5)]), "Wrong centers"
+    assert np.allclose(lengths, [2.0, 1.0]), "Wrong lengths"
+    assert np.allclose(oris, [0.0, -90.0]), "Wrong orientations"
+
+
+def test_motion_trails_fade_out() -> None:
+    """Newer segments are more opaque, and nothing joins the newest to the oldest position."""
+    # No need for a real window or stimulus; we only check what would be drawn
+    with patch("src.trails.visual.ElementArrayStim"):
+        trails = MotionTrails(Mock(), colors=["red"], length=4, opacity=0.6)
+
+    for x in [0.0, 1.0, 2.0, 3.0, 4.0]:
+        trails.update(np.array([(x, 0.0)]))
+
+    # Slots hold x = 4, 1, 2, 3; segments start at slots 0..3
+    opacities = trails.stimulus.opacities
+    assert np.allclose(opacities, [0.0, 0.2, 0.4, 0.6]), "Wrong fade"
+    assert np.allclose(trails.stimulus.xys[1:], [(1.5, 0), (2.5, 0), (3.5, 0)])
+    assert np.allclose(trails.stimulus.sizes[1:, 0], 1.0), "Wrong segment lengths"
+
+
+def test_trail_buffer_needs_two_positions() -> None:
+    with pytest.raises(ValueError):
+        TrailBuffer(n_agents=1, length=1)
@@ -0,0 +1,88 @@
+import numpy as np
+import pytest
+from src.config import AgentConfig, CircleConfig, get_config
+from src.inputs import TraceInput
+from src.spawn import spawn_distances
+from src.utils import (
+    create_replay_clock,
+    create_spawn_layout,
+    measure_frame_period,
+    use_simulation_process,
+    warm_up,
+)
+from unittest.mock import Mock, call
+
+
+def test_warm_up_draws_offscreen() -> None:
+    """Every stimulus is drawn on every warm-up frame, and cleared before the flip."""
+    # A config of our own: the real display config is shared by all configs
+    config = Mock(display=Mock(warm_up_frames=3))
+
+    # One parent mock records the order of all calls
+    calls = Mock()
+    stimuli = [calls.first, calls.second]
+    warm_up(calls.win, stimuli, config)
+
+    frame = [
+        call.first.draw(),
+        call.second.draw(),
+        call.win.clearBuffer(),
+        call.win.flip(),
+    ]
+    assert calls.mock_calls == 3 * frame, "Stimuli weren't drawn offscreen"
+
+
+def test_measure_frame_period() -> None:
+    config = Mock(display=Mock(timing_warm_up_frames=5, nominal_refresh_rate=60.0))
+    win = Mock()
+
+    win.getActualFrameRate.return_value = 120.0
+    assert measure_frame_period(win, config) == pytest.approx(1 / 120)
+    assert win.getActualFrameRate.call_args.kwargs["nWarmUpFrames"] == 5
+
+    # PsychoPy returns None if the frame times never settle
+    win.getActualFrameRate.return_value = None
+    assert measure_frame_period(win, config) == pytest.approx(
+        1 / 60
+    ), "Didn't fall back to the nominal refresh rate"
+
+
+def test_replays_simulate_in_process() -> None:
+    """Replays never use the simulation process, whose frames depend on timing."""
+    config = Mock(simulation_process=True, replay=Mock(trace_path=None))
+    assert use_simulation_process(config)
+
+    config.replay.trace_path = "trace.npy"
+    assert not use_simulation_process(config), "Replay used the simulation process"
+
+
+def test_cached_spawn_layout_depends_on_sheep(tmp_path) -> None:
+    """A bigger sheep needs more room, so it must not get a cached layout."""
+    config = get_config("demo")
+    config.replay.seed = 3
+    config.cache.directory = str(tmp_path)
+    (first,) = create_spawn_layout(config, [config.wolf], [8], safe_pos=(0.0, 0.0))
+
+    config.sheep = AgentConfig(shape_type="circle", config=CircleConfig(size=6.0))
+    (second,) = create_spawn_layout(config, [config.wolf], [8], safe_pos=(0.0, 0.0))
+
+    assert not np.array_equal(first, second), "Reused the smaller sheep's layout"
+    _, safety_radius = spawn_distances([config.wolf], config.spawn, config.sheep)
+    assert np.all(
+        np.hypot(second[:, 0], second[:, 1]) >= safety_radius
+    ), "Agents spawned too close to the sheep"
+
+
+@pytest.mark.parametrize(
+    "trace_period, frame_rate, expected_rate",
+    [(1 / 120, None, 120.0), (None, None, 50.0), (1 / 120, 30.0, 30.0)],
+)
+def test_replay_clock_rate(
+    trace_period: float | None, frame_rate: float | None, expected_rate: float
+) -> None:
+    """Replays run at the trace's recorded rate, else the display's, unless configured."""
+    config = Mock(replay=Mock(frame_rate=frame_rate))
+    win = Mock(monitorFramePeriod=1 / 50)
+    trace = TraceInput(np.zeros((1, 2)), frame_period=trace_period)
+    clock = create_replay_clock(trace, win, config)
+    assert clock.frame_rate == pytest.approx(expected_rate)